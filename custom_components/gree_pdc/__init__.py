@@ -1,85 +1,158 @@
 import logging
-import asyncio
-from datetime import timedelta
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.const import CONF_HOST, Platform
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.storage import Store
 
-from .const import DOMAIN, CONF_ID, CONF_KEY, STATUS_COLS, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL, CONF_NAME
+from .const import (
+    DOMAIN,
+    CONF_ID,
+    CONF_KEY,
+    CONF_SCAN_INTERVAL,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_IDLE_SCAN_INTERVAL,
+    CONF_SUPPORTED_COLS,
+    CONF_PROBED_COLS,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    PROBE_BATCH_SIZE,
+    STORAGE_VERSION,
+)
+from .coordinator import GreePDCCoordinator
 from .gree_api import GreePDCClient
+from .registers import LEGACY_COLS, STATUS_COLS
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.SENSOR, Platform.BINARY_SENSOR, Platform.SWITCH, Platform.NUMBER, Platform.SELECT]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config) -> bool:
+    """Set up the Gree PDC services."""
+    async_setup_services(hass)
+    return True
+
+def _frame_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the store of the last good frame of an entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+
+def _known_columns(entry: ConfigEntry):
+    """Return the supported columns stored in the entry.
+
+    Entries created before the registers were probed get the columns
+    polled back then, until a probe succeeds.
+    """
+    return entry.data.get(CONF_SUPPORTED_COLS, LEGACY_COLS)
+
+async def _async_probe_new_columns(hass: HomeAssistant, entry: ConfigEntry, client: GreePDCClient):
+    """Probe the catalog columns added since the entry was last probed.
+
+    Runs in the background once the entry is set up. The supported and the
+    probed columns are stored in the entry, and the entry is reloaded when
+    the unit supports new registers so their entities are added. When the
+    unit does not answer, the known columns are kept and probed again on
+    the next setup.
+    """
+    supported = _known_columns(entry)
+    # Entries stored before the probed columns were kept only know the supported ones
+    probed = entry.data.get(CONF_PROBED_COLS, entry.data.get(CONF_SUPPORTED_COLS, []))
+    new = [col for col in STATUS_COLS if col not in probed]
+    if not new:
+        return
+    try:
+        answered = await client.async_probe_columns(new, PROBE_BATCH_SIZE)
+    except Exception as err:
+        _LOGGER.warning("Could not probe the registers of %s, probing again on next setup: %s", entry.title, err)
+        return
+    # Columns of entries never probed are only kept when the unit answered them
+    kept = set(supported) & set(probed)
+    columns = [col for col in STATUS_COLS if col in kept or col in answered]
+    _LOGGER.info(
+        "%s supports %d of %d probed registers; unsupported: %s",
+        entry.title, len(answered), len(new),
+        ", ".join(col for col in new if col not in answered) or "none",
+    )
+    hass.config_entries.async_update_entry(entry, data={
+        **entry.data,
+        CONF_SUPPORTED_COLS: columns,
+        CONF_PROBED_COLS: sorted(set(probed) | set(new)),
+    })
+    if set(columns) != set(supported):
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Gree PDC from a config entry."""
     _LOGGER.debug("Setting up Gree PDC entry for host %s", entry.data[CONF_HOST])
     client = GreePDCClient(
         entry.data[CONF_HOST],
         entry.data[CONF_ID],
-        entry.data[CONF_KEY]
+        entry.data[CONF_KEY],
     )
 
+    @callback
+    def async_key_changed(key):
+        """Store the key of a unit that was bound again."""
+        hass.config_entries.async_update_entry(entry, data={**entry.data, CONF_KEY: key})
+
+    client.on_key_change = async_key_changed
+
     # Use the scan interval from options, fallback to data, then to default
     scan_interval = entry.options.get(
         CONF_SCAN_INTERVAL, 
         entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
     )
 
-    async def async_update_data():
-        """Fetch data from Gree PDC."""
-        try:
-            # Get main status
-            _LOGGER.debug("Fetching status from %s with columns %s", client.host, STATUS_COLS)
-            try:
-                main_status = await asyncio.wait_for(
-                    hass.async_add_executor_job(client.get_values, STATUS_COLS),
-                    timeout=3.0
-                )
-            except asyncio.TimeoutError:
-                _LOGGER.error("Polling cycle timed out (3s) for %s", client.host)
-                raise UpdateFailed("Polling cycle timed out")
-            
-            data = {}
-            if main_status:
-                data.update(dict(zip(main_status['cols'], main_status['dat'])))
-            
-            _LOGGER.debug("Data updated: %s", data if data else "no data")
-            return data
-        except UpdateFailed:
-            raise
-        except Exception as err:
-            _LOGGER.error("Error communicating with API at %s: %s", client.host, err)
-            raise UpdateFailed(f"Error communicating with API: {err}")
-
-    coordinator = DataUpdateCoordinator(
+    coordinator = GreePDCCoordinator(
         hass,
-        _LOGGER,
-        name="gree_pdc",
-        update_method=async_update_data,
-        update_interval=timedelta(seconds=scan_interval),
+        client,
+        _known_columns(entry),
+        scan_interval,
+        entry.options.get(CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL),
+        entry.options.get(CONF_IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL),
+        store=_frame_store(hass, entry),
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    if await coordinator.async_restore():
+        # Entities start from the restored frame: don't hold up startup
+        # waiting for the unit to answer
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh {entry.title}"
+        )
+    else:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            client.close()
+            raise
 
     # Add options update listener
     entry.async_on_unload(entry.add_update_listener(async_update_options))
 
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = {
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "coordinator": coordinator,
         "client": client,
+        "options": dict(entry.options),
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.async_create_background_task(
+        hass, _async_probe_new_columns(hass, entry, client), f"{DOMAIN} probe {entry.title}"
+    )
+
     _LOGGER.info("Gree PDC setup completed successfully for %s", entry.title)
     return True
 
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Update options."""
+    """Reload the entry when its options changed."""
+    entry_data = hass.data[DOMAIN].get(entry.entry_id)
+    if entry_data is not None and entry_data["options"] == entry.options:
+        # Only the data changed, e.g. the key of a unit bound again
+        return
     await hass.config_entries.async_reload(entry.entry_id)
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -87,7 +160,15 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _LOGGER.debug("Unloading Gree PDC entry %s", entry.entry_id)
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        await entry_data["coordinator"].async_shutdown()
+        client = entry_data["client"]
+        _LOGGER.debug("Gree request gate statistics of %s: %s", entry.title, client.gate.stats())
+        client.close()
         _LOGGER.info("Gree PDC unloaded successfully")
 
     return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted frame of a deleted entry."""
+    await _frame_store(hass, entry).async_remove()
@@ -7,10 +7,11 @@ from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntityDescription,
 )
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.const import EntityCategory
 
-from .const import DOMAIN, CONF_ID, CONF_NAME
+from .const import DOMAIN
+from .entity import GreePDCEntity
+from .registers import register_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,22 +19,13 @@ _LOGGER = logging.getLogger(__name__)
 class GreePDCBinarySensorEntityDescription(BinarySensorEntityDescription):
     """Custom description for Gree PDC binary sensors."""
     transform: Callable[[dict], Any] | None = None
+    cols: tuple[str, ...] = ()
 
-class GreePDCBinarySensor(CoordinatorEntity, BinarySensorEntity):
-    _attr_has_entity_name = True
+class GreePDCBinarySensor(GreePDCEntity, BinarySensorEntity):
 
     def __init__(self, coordinator, entry, description: GreePDCBinarySensorEntityDescription):
-        super().__init__(coordinator)
+        super().__init__(coordinator, entry, description.key, frozenset(description.cols) or None)
         self.entity_description = description
-        self._entry_id = entry.entry_id
-        device_name = entry.data.get(CONF_NAME, "Gree PDC")
-        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name=device_name,
-            manufacturer="Gree",
-            model="Versati",
-        )
 
     @property
     def is_on(self):
@@ -49,59 +41,41 @@ class GreePDCBinarySensor(CoordinatorEntity, BinarySensorEntity):
 async def async_setup_entry(hass, entry, async_add_entities):
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     
+    columns = coordinator.columns
     descriptions = [
         GreePDCBinarySensorEntityDescription(
-            key="power",
-            translation_key="power",
-            device_class=BinarySensorDeviceClass.POWER,
-            transform=lambda d: d.get("Pow") == 1,
-        ),
-        GreePDCBinarySensorEntityDescription(
-            key="quiet_mode",
-            translation_key="quiet_mode",
-            transform=lambda d: d.get("Quiet") == 1,
-        ),
-        GreePDCBinarySensorEntityDescription(
-            key="boiler_heat_resistance",
-            translation_key="boiler_heat_resistance",
-            transform=lambda d: d.get("WatBoxElcHeRunSta") == 1,
-        ),
-        GreePDCBinarySensorEntityDescription(
-            key="rapid_dhw",
-            translation_key="rapid_dhw",
-            transform=lambda d: d.get("FastHtWter") == 1,
-        ),
-        GreePDCBinarySensorEntityDescription(
-            key="dhw_boiler_equipped",
-            translation_key="dhw_boiler_equipped",
-            transform=lambda d: d.get("WatBoxExt") == 1,
-        ),
-        GreePDCBinarySensorEntityDescription(
-            key="antifreeze_function",
-            translation_key="antifreeze_function",
-            transform=lambda d: d.get("SyAnFroRunSta") == 1,
-        ),
-        GreePDCBinarySensorEntityDescription(
-            key="defrost_cycle",
-            translation_key="defrost_cycle",
-            transform=lambda d: d.get("AnFrzzRunSta") == 1,
-        ),
-        GreePDCBinarySensorEntityDescription(
-            key="heating_state",
-            translation_key="heating_state",
-            transform=lambda d: d.get("Mod") in (1, 4),
-        ),
-        GreePDCBinarySensorEntityDescription(
-            key="cooling_state",
-            translation_key="cooling_state",
-            transform=lambda d: d.get("Mod") in (3, 5),
-        ),
-        GreePDCBinarySensorEntityDescription(
-            key="dhw_state",
-            translation_key="dhw_state",
-            transform=lambda d: d.get("Mod") in (2, 3, 4),
-        ),
+            key=entity.key,
+            translation_key=entity.translation_key,
+            icon=entity.icon,
+            device_class=BinarySensorDeviceClass(entity.device_class) if entity.device_class else None,
+            entity_category=EntityCategory.DIAGNOSTIC if entity.diagnostic else None,
+            entity_registry_enabled_default=entity.enabled_default,
+            transform=lambda d, col=register.name: d.get(col) == 1,
+            cols=(register.name,),
+        )
+        for register, entity in register_entities(columns, "binary_sensor")
     ]
+    if "Mod" in columns:
+        descriptions += [
+            GreePDCBinarySensorEntityDescription(
+                key="heating_state",
+                translation_key="heating_state",
+                transform=lambda d: d.get("Mod") in (1, 4),
+                cols=("Mod",),
+            ),
+            GreePDCBinarySensorEntityDescription(
+                key="cooling_state",
+                translation_key="cooling_state",
+                transform=lambda d: d.get("Mod") in (3, 5),
+                cols=("Mod",),
+            ),
+            GreePDCBinarySensorEntityDescription(
+                key="dhw_state",
+                translation_key="dhw_state",
+                transform=lambda d: d.get("Mod") in (2, 3, 4),
+                cols=("Mod",),
+            ),
+        ]
     
     _LOGGER.debug("Adding %d binary sensors", len(descriptions))
     async_add_entities([GreePDCBinarySensor(coordinator, entry, desc) for desc in descriptions])
@@ -1,22 +1,91 @@
+import asyncio
 import logging
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.const import CONF_HOST
+import homeassistant.helpers.config_validation as cv
 from .const import (
     DOMAIN, 
     CONF_ID, 
     CONF_KEY, 
     CONF_NAME,
     CONF_SCAN_INTERVAL, 
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_IDLE_SCAN_INTERVAL,
+    CONF_TEMP_DEADBAND,
+    CONF_TEMP_MIN_INTERVAL,
+    CONF_SENSOR_FILTERS,
+    CONF_SUPPORTED_COLS,
+    CONF_PROBED_COLS,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_TEMP_DEADBAND,
+    DEFAULT_TEMP_MIN_INTERVAL,
+    MAX_TEMP_DEADBAND,
+    MAX_TEMP_MIN_INTERVAL,
     MIN_SCAN_INTERVAL,
-    MAX_SCAN_INTERVAL
+    MAX_SCAN_INTERVAL,
+    PROBE_BATCH_SIZE,
 )
+from .discovery import async_discover, parse_target
 from .gree_api import GreePDCClient
+from .registers import LEGACY_COLS, STATUS_COLS, RegisterType, register_entities
+from .filtering import sensor_filter
 
 _LOGGER = logging.getLogger(__name__)
 
+# Bulk onboarding: devices bound at once and bind attempts per device
+BIND_CONCURRENCY = 4
+BIND_ATTEMPTS = 3
+
+DEADBAND_RANGE = vol.All(vol.Coerce(float), vol.Range(min=0, max=MAX_TEMP_DEADBAND))
+MIN_INTERVAL_RANGE = vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_TEMP_MIN_INTERVAL))
+
+
+async def async_bind_device(device):
+    """Bind a discovered device, retrying with backoff; return its key or None."""
+    client = GreePDCClient(device["host"], device["id"], "")
+    try:
+        for attempt in range(1, BIND_ATTEMPTS + 1):
+            _LOGGER.debug("Binding to device %s at %s (attempt %d)", device["id"], device["host"], attempt)
+            if await client.async_bind():
+                return client.device_key
+            if attempt < BIND_ATTEMPTS:
+                await asyncio.sleep(attempt)
+    finally:
+        client.close()
+    return None
+
+
+async def async_probe_device(device, key):
+    """Return the catalog columns a bound device supports, or None when it did not answer."""
+    client = GreePDCClient(device["host"], device["id"], key)
+    try:
+        answered = await client.async_probe_columns(STATUS_COLS, PROBE_BATCH_SIZE)
+    except Exception as err:
+        _LOGGER.warning("Could not probe the registers of %s, probing again on setup: %s", device["id"], err)
+        return None
+    finally:
+        client.close()
+    return [col for col in STATUS_COLS if col in answered]
+
+
+def _entry_data(device, name, key, scan_interval, supported=None):
+    data = {
+        CONF_HOST: device["host"],
+        CONF_ID: device["id"],
+        CONF_KEY: key,
+        CONF_NAME: name,
+        CONF_SCAN_INTERVAL: scan_interval,
+    }
+    if supported is not None:
+        data[CONF_SUPPORTED_COLS] = supported
+        data[CONF_PROBED_COLS] = sorted(STATUS_COLS)
+    return data
+
+
 class GreePDCConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
@@ -24,51 +93,148 @@ class GreePDCConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._devices = []
         self._host = None
         self._selected_device = None
+        self._discovery_task = None
 
     async def async_step_user(self, user_input=None):
         errors = {}
         if user_input is not None:
-            self._host = user_input[CONF_HOST]
             try:
-                self._devices = await self.hass.async_add_executor_job(
-                    GreePDCClient.scan, self._host
-                )
-                _LOGGER.debug("Discovered %d devices at %s", len(self._devices), self._host)
-                if not self._devices:
-                    _LOGGER.warning("No devices found at %s", self._host)
-                    errors["base"] = "cannot_connect"
-                elif len(self._devices) == 1:
-                    self._selected_device = self._devices[0]
-                    _LOGGER.info("Automatically selected device %s (%s)", self._selected_device['name'], self._selected_device['id'])
-                    return await self.async_step_name()
-                else:
-                    return await self.async_step_select()
-            except Exception as e:
-                _LOGGER.error("Error during scan at %s: %s", self._host, e)
-                errors["base"] = "cannot_connect"
+                parse_target(user_input[CONF_HOST])
+            except ValueError:
+                errors["base"] = "invalid_host"
+            else:
+                self._host = user_input[CONF_HOST].strip()
+                self._devices = []
+                self._discovery_task = None
+                return await self.async_step_discover()
+
+        return self._async_show_user_form(errors)
 
+    def _async_show_user_form(self, errors):
         return self.async_show_form(
             step_id="user",
             data_schema=vol.Schema({
-                vol.Required(CONF_HOST): str,
+                vol.Required(CONF_HOST, default=self._host or vol.UNDEFINED): str,
             }),
             errors=errors,
         )
 
+    async def _async_discover(self):
+        """Collect devices as they answer, updating the progress bar."""
+        async for device in async_discover(self._host, on_progress=self.async_update_progress):
+            _LOGGER.debug("Discovered device %s (%s) at %s", device["name"], device["id"], device["host"])
+            self._devices.append(device)
+
+    async def async_step_discover(self, user_input=None):
+        """Scan the given address or network while showing progress."""
+        if self._discovery_task is None:
+            self._discovery_task = self.hass.async_create_task(self._async_discover())
+        if not self._discovery_task.done():
+            return self.async_show_progress(
+                step_id="discover",
+                progress_action="discover",
+                progress_task=self._discovery_task,
+                description_placeholders={"host": self._host},
+            )
+        return self.async_show_progress_done(next_step_id="discovered")
+
+    async def async_step_discovered(self, user_input=None):
+        """Continue with the devices found by the scan."""
+        task, self._discovery_task = self._discovery_task, None
+        errors = {}
+        if task.exception() is not None:
+            _LOGGER.error("Error during scan at %s: %s", self._host, task.exception())
+            errors["base"] = "cannot_connect"
+        elif not self._devices:
+            _LOGGER.warning("No devices found at %s", self._host)
+            errors["base"] = "cannot_connect"
+        elif len(self._devices) == 1:
+            self._selected_device = self._devices[0]
+            await self.async_set_unique_id(self._selected_device["id"])
+            self._abort_if_unique_id_configured()
+            _LOGGER.info("Automatically selected device %s (%s)", self._selected_device['name'], self._selected_device['id'])
+            return await self.async_step_name()
+        else:
+            _LOGGER.debug("Discovered %d devices at %s", len(self._devices), self._host)
+            return await self.async_step_select()
+
+        return self._async_show_user_form(errors)
+
     async def async_step_select(self, user_input=None):
+        """Pick one device to name, or several to add at once."""
+        configured = self._async_current_ids()
+        available = [d for d in self._devices if d["id"] not in configured]
+        if not available:
+            return self.async_abort(reason="already_configured")
+
+        errors = {}
         if user_input is not None:
-            device_id = user_input["device"]
-            self._selected_device = next(d for d in self._devices if d["id"] == device_id)
-            return await self.async_step_name()
+            selected = [d for d in available if d["id"] in user_input["devices"]]
+            if not selected:
+                errors["base"] = "no_devices_selected"
+            elif len(selected) == 1:
+                self._selected_device = selected[0]
+                return await self.async_step_name()
+            else:
+                result = await self._async_add_devices(selected)
+                if result is not None:
+                    return result
+                errors["base"] = "cannot_connect"
 
-        device_options = {d["id"]: f"{d['name']} ({d['host']})" for d in self._devices}
+        device_options = {d["id"]: f"{d['name']} ({d['host']})" for d in available}
         return self.async_show_form(
             step_id="select",
             data_schema=vol.Schema({
-                vol.Required("device"): vol.In(device_options),
+                vol.Required("devices", default=list(device_options)): cv.multi_select(device_options),
             }),
+            errors=errors,
         )
 
+    async def _async_add_devices(self, devices):
+        """Bind and probe ``devices`` concurrently and create one entry per bound device.
+
+        The first entry is created by this flow, the others through import
+        flows. Returns None when no device could be bound.
+        """
+        semaphore = asyncio.Semaphore(BIND_CONCURRENCY)
+
+        async def bind(device):
+            async with semaphore:
+                key = await async_bind_device(device)
+                if not key:
+                    return None
+                return _entry_data(device, device["name"], key, DEFAULT_SCAN_INTERVAL,
+                                   await async_probe_device(device, key))
+
+        entries = await asyncio.gather(*(bind(device) for device in devices))
+        bound = [data for data in entries if data]
+        for device, data in zip(devices, entries):
+            if not data:
+                _LOGGER.error("Binding failed for device %s at %s", device["id"], device["host"])
+        if not bound:
+            return None
+
+        _LOGGER.info("Bound %d of %d selected devices", len(bound), len(devices))
+        for data in bound[1:]:
+            self.hass.async_create_task(
+                self.hass.config_entries.flow.async_init(
+                    DOMAIN,
+                    context={"source": config_entries.SOURCE_IMPORT},
+                    data=data,
+                )
+            )
+
+        data = bound[0]
+        await self.async_set_unique_id(data[CONF_ID])
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(title=data[CONF_NAME], data=data)
+
+    async def async_step_import(self, import_data):
+        """Create the entry of a device bound during bulk onboarding."""
+        await self.async_set_unique_id(import_data[CONF_ID])
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(title=import_data[CONF_NAME], data=import_data)
+
     async def async_step_name(self, user_input=None):
         errors = {}
         if user_input is not None:
@@ -76,24 +242,17 @@ class GreePDCConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             scan_interval = user_input.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
             
             # Perform binding
-            _LOGGER.debug("Binding to device %s at %s", self._selected_device["id"], self._selected_device["host"])
-            client = GreePDCClient(self._selected_device["host"], self._selected_device["id"], "")
-            success = await self.hass.async_add_executor_job(client.bind)
+            key = await async_bind_device(self._selected_device)
             
-            if success:
+            if key:
                 _LOGGER.info("Binding successful for device %s", self._selected_device["id"])
                 await self.async_set_unique_id(self._selected_device["id"])
                 self._abort_if_unique_id_configured()
                 
+                supported = await async_probe_device(self._selected_device, key)
                 return self.async_create_entry(
                     title=custom_name,
-                    data={
-                        CONF_HOST: self._selected_device["host"],
-                        CONF_ID: self._selected_device["id"],
-                        CONF_KEY: client.device_key,
-                        CONF_NAME: custom_name,
-                        CONF_SCAN_INTERVAL: scan_interval,
-                    }
+                    data=_entry_data(self._selected_device, custom_name, key, scan_interval, supported),
                 )
             else:
                 _LOGGER.error("Binding failed for device %s", self._selected_device["id"])
@@ -122,23 +281,84 @@ class GreePDCOptionsFlowHandler(config_entries.OptionsFlow):
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         """Initialize options flow."""
         self._config_entry = config_entry
+        self._options = {}
+
+    def _temperature_sensors(self):
+        """Return the keys of the temperature sensors of the entry."""
+        entry_data = self.hass.data.get(DOMAIN, {}).get(self._config_entry.entry_id)
+        if entry_data is not None:
+            columns = entry_data["coordinator"].columns
+        else:
+            columns = self._config_entry.data.get(CONF_SUPPORTED_COLS, LEGACY_COLS)
+        return [
+            entity.key
+            for register, entity in register_entities(columns, "sensor")
+            if register.type is RegisterType.TEMP
+        ]
 
     async def async_step_init(self, user_input=None):
         """Manage the options."""
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            self._options = user_input
+            return await self.async_step_sensors()
 
         # Use the stored config entry
         current_interval = self._config_entry.options.get(CONF_SCAN_INTERVAL)
         if current_interval is None:
             current_interval = self._config_entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
 
+        interval_range = vol.All(vol.Coerce(int), vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL))
+        options = self._config_entry.options
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema({
                 vol.Required(
                     CONF_SCAN_INTERVAL,
                     default=int(current_interval),
-                ): vol.All(vol.Coerce(int), vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL)),
+                ): interval_range,
+                vol.Required(
+                    CONF_FAST_SCAN_INTERVAL,
+                    default=int(options.get(CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL)),
+                ): interval_range,
+                vol.Required(
+                    CONF_IDLE_SCAN_INTERVAL,
+                    default=int(options.get(CONF_IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL)),
+                ): interval_range,
+                vol.Required(
+                    CONF_TEMP_DEADBAND,
+                    default=float(options.get(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND)),
+                ): DEADBAND_RANGE,
+                vol.Required(
+                    CONF_TEMP_MIN_INTERVAL,
+                    default=int(options.get(CONF_TEMP_MIN_INTERVAL, DEFAULT_TEMP_MIN_INTERVAL)),
+                ): MIN_INTERVAL_RANGE,
             }),
         )
+
+    async def async_step_sensors(self, user_input=None):
+        """Override the deadband and minimum interval of single temperature sensors.
+
+        The fields default to the sensor's own settings, or to the ones of
+        all temperature sensors just entered. Only values differing from
+        the latter are stored.
+        """
+        keys = self._temperature_sensors()
+        if user_input is not None:
+            filters = {}
+            for key in keys:
+                own = {
+                    option: user_input[f"{key}_{option}"]
+                    for option in (CONF_TEMP_DEADBAND, CONF_TEMP_MIN_INTERVAL)
+                    if user_input[f"{key}_{option}"] != self._options[option]
+                }
+                if own:
+                    filters[key] = own
+            return self.async_create_entry(title="", data={**self._options, CONF_SENSOR_FILTERS: filters})
+
+        current = {**self._options, CONF_SENSOR_FILTERS: self._config_entry.options.get(CONF_SENSOR_FILTERS, {})}
+        schema = {}
+        for key in keys:
+            deadband, min_interval = sensor_filter(current, key)
+            schema[vol.Required(f"{key}_{CONF_TEMP_DEADBAND}", default=float(deadband))] = DEADBAND_RANGE
+            schema[vol.Required(f"{key}_{CONF_TEMP_MIN_INTERVAL}", default=int(min_interval))] = MIN_INTERVAL_RANGE
+        return self.async_show_form(step_id="sensors", data_schema=vol.Schema(schema))
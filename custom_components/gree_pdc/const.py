@@ -5,19 +5,72 @@ CONF_ID = "id"
 CONF_KEY = "key"
 CONF_NAME = "name"
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_FAST_SCAN_INTERVAL = "fast_scan_interval"
+CONF_IDLE_SCAN_INTERVAL = "idle_scan_interval"
+CONF_TEMP_DEADBAND = "temperature_deadband"
+CONF_TEMP_MIN_INTERVAL = "temperature_min_interval"
+CONF_SENSOR_FILTERS = "sensor_filters"
+CONF_SUPPORTED_COLS = "supported_cols"
+CONF_PROBED_COLS = "probed_cols"
 
 DEFAULT_PORT = 7000
 DEFAULT_SCAN_INTERVAL = 10
+DEFAULT_FAST_SCAN_INTERVAL = 5
+DEFAULT_IDLE_SCAN_INTERVAL = 60
 MIN_SCAN_INTERVAL = 5
 MAX_SCAN_INTERVAL = 600
 
+# Temperature sensors only write a new state when the value moved by at
+# least the deadband (°C), or differs at all after the heartbeat (seconds),
+# and at most once per minimum interval (seconds). Both defaults can be
+# overridden per sensor in the options.
+DEFAULT_TEMP_DEADBAND = 0.2
+MAX_TEMP_DEADBAND = 2.0
+DEFAULT_TEMP_MIN_INTERVAL = 0
+TEMP_HEARTBEAT = 900
+MAX_TEMP_MIN_INTERVAL = TEMP_HEARTBEAT
+
+# Adaptive polling: a change of these columns switches to the fast interval
+TRANSITION_COLS = ("Pow", "Mod", "AnFrzzRunSta", "FastHtWter", "WatBoxElcHeRunSta")
+# While any of these is active the fast interval is kept
+FAST_POLL_COLS = ("AnFrzzRunSta", "FastHtWter", "WatBoxElcHeRunSta")
+# Growth factor of the interval when relaxing back towards the target
+INTERVAL_DECAY = 1.5
+
+# Total time budget (seconds) of one status poll, retransmissions included
+POLL_TIMEOUT = 3.0
+
+# Status and bind requests in flight per device, plus the slots only
+# commands may take
+REQUESTS_PER_DEVICE = 2
+COMMAND_SLOTS = 1
+
 GENERIC_KEY = "a3K8Bx%2r8Y7#xDh"
+SCAN_REQUEST = b'{"t":"scan"}'
+
+# Raw frames kept in memory per device: 24 hours at the fastest interval
+HISTORY_SIZE = 24 * 3600 // MIN_SCAN_INTERVAL
+
+# Last good frame persisted per device, restored at startup
+STORAGE_VERSION = 1
+# Seconds between writes of the persisted frame
+FRAME_SAVE_DELAY = 60
+# Persisted frames older than this (seconds) are not restored
+RESTORE_MAX_AGE = 24 * 3600
+# State attribute of entities showing a restored frame not yet confirmed by a poll
+ATTR_RESTORED = "restored"
+
+# Written columns are read back this long (seconds) after the ack, within
+# a budget of VERIFY_TIMEOUT seconds
+VERIFY_DELAY = 0.3
+VERIFY_TIMEOUT = 1.0
+# Fired when a unit did not apply a written value
+EVENT_COMMAND_NOT_APPLIED = f"{DOMAIN}_command_not_applied"
+
+# Columns per status request when probing the registers a unit supports
+PROBE_BATCH_SIZE = 16
 
-# Status columns from gree_decode.py
-STATUS_COLS = [
-    "Pow", "Mod", "WatBoxTemSet", "HeWatOutTemSet", "CoWatOutTemSet",
-    "HeHomTemSet", "CoHomTemSet", "Quiet", "AllInWatTemHi", "AllInWatTemLo",
-    "AllOutWatTemHi", "AllOutWatTemLo", "WatBoxTemHi", "WatBoxTemLo",
-    "WatBoxElcHeRunSta", "FastHtWter", "RmoHomTemHi", "RmoHomTemLo", "WatBoxExt",
-    "SyAnFroRunSta", "AnFrzzRunSta"
-]
+# Polling tiers (see registers.py): a column is read every N polling cycles
+TIER_HOT = 1
+TIER_WARM = 6
+TIER_COLD = 60
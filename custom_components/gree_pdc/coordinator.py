@@ -0,0 +1,360 @@
+"""Data update coordinator for Gree PDC."""
+import asyncio
+import logging
+import time
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .const import (
+    EVENT_COMMAND_NOT_APPLIED,
+    FAST_POLL_COLS,
+    FRAME_SAVE_DELAY,
+    HISTORY_SIZE,
+    INTERVAL_DECAY,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    POLL_TIMEOUT,
+    RESTORE_MAX_AGE,
+    TRANSITION_COLS,
+    VERIFY_DELAY,
+    VERIFY_TIMEOUT,
+)
+from .gree_api import DeviceOfflineError, GreePDCClient, KeyMismatchError
+from .history import FrameHistory
+from .metrics import LatencyHistogram
+from .registers import supported_registers
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PollScheduler:
+    """Decide which columns are due on each polling cycle.
+
+    Every column belongs to a tier and is read every ``tier`` successful
+    cycles. Columns never read yet, or explicitly requested, are always due.
+    """
+
+    def __init__(self, tiers):
+        self._tiers = dict(tiers)
+        self._cycle = 0
+        self._seen = set()
+        self._requested = set()
+
+    def due_columns(self):
+        """Return the columns to read on the current cycle."""
+        return [
+            col for col, every in self._tiers.items()
+            if col not in self._seen or col in self._requested or self._cycle % every == 0
+        ]
+
+    def mark_polled(self, cols):
+        """Record a successful cycle that read ``cols``."""
+        self._seen.update(cols)
+        self._requested.difference_update(cols)
+        self._cycle += 1
+
+    def request(self, cols):
+        """Read ``cols`` on the next cycle regardless of their tier."""
+        self._requested.update(col for col in cols if col in self._tiers)
+
+
+class AdaptiveIntervalPolicy:
+    """Pick the polling interval from the state of the unit.
+
+    Transitions of TRANSITION_COLS and written commands switch to the fast
+    interval, which is kept while defrost or a DHW boost is running. Then
+    the interval grows by INTERVAL_DECAY per cycle back to the normal
+    interval, or to the idle interval while the unit is off.
+    """
+
+    def __init__(self, normal, fast, idle):
+        def clamp(value):
+            return max(MIN_SCAN_INTERVAL, min(MAX_SCAN_INTERVAL, value))
+
+        self.normal = clamp(normal)
+        self.fast = clamp(min(fast, self.normal))
+        self.idle = clamp(max(idle, self.normal))
+        self.current = self.normal
+
+    def boost(self):
+        """Switch to the fast interval."""
+        self.current = self.fast
+        return self.current
+
+    def next_interval(self, previous, data):
+        """Return the interval (seconds) until the poll following ``data``."""
+        if previous and any(previous.get(col) != data.get(col) for col in TRANSITION_COLS):
+            self.boost()
+
+        if any(data.get(col) == 1 for col in FAST_POLL_COLS):
+            target = self.fast
+        elif data.get("Pow") == 0:
+            target = self.idle
+        else:
+            target = self.normal
+
+        if self.current < target:
+            self.current = min(target, self.current * INTERVAL_DECAY)
+        else:
+            self.current = target
+        return self.current
+
+
+class GreePDCCoordinator(DataUpdateCoordinator):
+    """Poll a Gree PDC unit, reading each column at the rate of its tier.
+
+    Only ``columns``, the registers of the catalog the unit supports, are
+    polled.
+
+    The interval between polls follows an AdaptiveIntervalPolicy. While the
+    circuit breaker of the client is open, polls only give it the chance to
+    probe the unit, at the probe interval of the breaker.
+
+    Every successful poll appends the merged frame to ``history``, a ring
+    buffer of raw values at full polling resolution.
+
+    With a ``store``, the last good frame is persisted (at most every
+    FRAME_SAVE_DELAY seconds) and async_restore() loads it back at startup,
+    so entities have a state before the unit answers. ``restored`` stays
+    true until a poll confirms the frame.
+
+    Acknowledged writes, handed over by the client once per coalesced
+    command, are applied to the data right away and read back
+    VERIFY_DELAY seconds later with a status request for the written
+    columns only. The values the unit reports replace the written ones; a
+    unit that did not apply a value (clamped a setpoint, refused a mode)
+    is logged and fires EVENT_COMMAND_NOT_APPLIED.
+
+    Entities register with the set of raw columns they are computed from
+    as their listener context. Those contexts form a column -> listener
+    index, and after a poll only the listeners of changed columns are
+    called. Listeners without a context are always called.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: GreePDCClient, columns, scan_interval,
+                 fast_scan_interval, idle_scan_interval, store=None):
+        self.interval_policy = AdaptiveIntervalPolicy(
+            scan_interval, fast_scan_interval, idle_scan_interval
+        )
+        super().__init__(
+            hass,
+            _LOGGER,
+            name="gree_pdc",
+            update_interval=timedelta(seconds=self.interval_policy.current),
+        )
+        self.client = client
+        registers = supported_registers(columns)
+        self.columns = [register.name for register in registers]
+        self.scheduler = PollScheduler({register.name: register.tier for register in registers})
+        self._dependents = {}
+        self._changed_cols = None
+        self.poll_duration = LatencyHistogram()
+        self.failed_polls = 0
+        self.history = FrameHistory(self.columns, HISTORY_SIZE)
+        self.restored = False
+        self._store = store
+        self._frame_time = None
+        self.command_mismatches = 0
+        self._write_seq = 0
+        self._last_writes = {}
+        self._verifications = set()
+        client.on_command_acked = self.async_handle_command
+
+    async def async_restore(self):
+        """Load the persisted frame as the current data, marked as restored.
+
+        Return whether a frame was restored.
+        """
+        if self._store is None:
+            return False
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:
+            _LOGGER.warning("Cannot load the last frame of %s: %s", self.client.host, err)
+            return False
+        if not stored or time.time() - stored.get("time", 0) > RESTORE_MAX_AGE:
+            return False
+
+        data = {col: value for col, value in stored.get("data", {}).items() if col in self.columns}
+        if not data:
+            return False
+        self.data = data
+        self.restored = True
+        _LOGGER.debug("Restored the last frame of %s: %s", self.client.host, data)
+        return True
+
+    @callback
+    def _stored_frame(self):
+        return {"time": self._frame_time, "data": self.data}
+
+    async def _async_update_data(self):
+        """Fetch the due columns and merge them into the last known frame."""
+        started = self.hass.loop.time()
+        try:
+            with self.client.spans.span("poll"):
+                return await self._async_poll()
+        except UpdateFailed:
+            self.failed_polls += 1
+            raise
+        finally:
+            self.poll_duration.record(self.hass.loop.time() - started)
+
+    async def _async_poll(self):
+        client = self.client
+        cols = self.scheduler.due_columns()
+        self._changed_cols = None
+        try:
+            _LOGGER.debug("Fetching status from %s with columns %s", client.host, cols)
+            try:
+                main_status = await client.async_get_values(cols, timeout=POLL_TIMEOUT)
+            except DeviceOfflineError as err:
+                self.update_interval = timedelta(seconds=client.breaker.probe_interval)
+                raise UpdateFailed(str(err))
+            except KeyMismatchError as err:
+                # Logged by the client, which keeps trying to bind the unit again
+                raise UpdateFailed(str(err))
+            except asyncio.TimeoutError:
+                if client.breaker.is_open:
+                    self.update_interval = timedelta(seconds=client.breaker.probe_interval)
+                else:
+                    _LOGGER.warning("Polling cycle timed out (%ss) for %s", POLL_TIMEOUT, client.host)
+                raise UpdateFailed("Polling cycle timed out")
+
+            with client.spans.span("merge"):
+                data = dict(self.data or {})
+                if main_status:
+                    data.update(zip(main_status['cols'], main_status['dat']))
+                    self.scheduler.mark_polled(main_status['cols'])
+                    # Columns of failed chunks stay due for the next poll
+                    self.scheduler.request(set(cols) - set(main_status['cols']))
+
+                if self.data is not None and self.last_update_success:
+                    previous = self.data
+                    self._changed_cols = {
+                        col for col, value in data.items()
+                        if col not in previous or previous[col] != value
+                    }
+                if self.restored:
+                    # Confirm the restored frame on every entity
+                    self.restored = False
+                    self._changed_cols = None
+                self._frame_time = time.time()
+                self.history.append(self._frame_time, data)
+
+            if self._store is not None:
+                self._store.async_delay_save(self._stored_frame, FRAME_SAVE_DELAY)
+
+            interval = self.interval_policy.next_interval(self.data, data)
+            self.update_interval = timedelta(seconds=interval)
+
+            _LOGGER.debug("Data updated: %s", data if data else "no data")
+            return data
+        except UpdateFailed:
+            raise
+        except Exception as err:
+            if client.breaker.is_open:
+                self.update_interval = timedelta(seconds=client.breaker.probe_interval)
+            else:
+                _LOGGER.error("Error communicating with API at %s: %s", client.host, err)
+            raise UpdateFailed(f"Error communicating with API: {err}")
+
+    @callback
+    def async_add_listener(self, update_callback, context=None):
+        """Listen for updates, indexing the listener by its source columns."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        if not context:
+            return remove_listener
+
+        for col in context:
+            self._dependents.setdefault(col, []).append(update_callback)
+
+        @callback
+        def remove_indexed_listener():
+            remove_listener()
+            for col in context:
+                self._dependents[col].remove(update_callback)
+
+        return remove_indexed_listener
+
+    @callback
+    def async_update_listeners(self):
+        """Notify the listeners of changed columns, or all when unknown."""
+        changed, self._changed_cols = self._changed_cols, None
+        with self.client.spans.span("state_writes"):
+            if changed is None:
+                super().async_update_listeners()
+                return
+
+            affected = {cb for col in changed for cb in self._dependents.get(col, ())}
+            for update_callback, context in list(self._listeners.values()):
+                if not context or update_callback in affected:
+                    update_callback()
+
+    @callback
+    def async_handle_command(self, values):
+        """Apply acknowledged written values and schedule their verification."""
+        self.update_interval = timedelta(seconds=self.interval_policy.boost())
+        self._write_seq += 1
+        for col in values:
+            self._last_writes[col] = self._write_seq
+        if self.data is not None:
+            self._changed_cols = set(values)
+            self.async_set_updated_data({**self.data, **values})
+        else:
+            self._schedule_refresh()
+
+        task = self.hass.async_create_task(self._async_verify(dict(values), self._write_seq))
+        self._verifications.add(task)
+        task.add_done_callback(self._verifications.discard)
+
+    async def _async_verify(self, values, seq):
+        """Read the columns of write ``seq`` back and reconcile the data with them.
+
+        Columns written again since are left to the verification of that
+        later write. Columns that cannot be read back are read on the next
+        poll instead.
+        """
+        await asyncio.sleep(VERIFY_DELAY)
+        cols = [col for col in values if self._last_writes.get(col) == seq]
+        if not cols:
+            return
+        client = self.client
+        try:
+            response = await client.async_get_values(cols, timeout=VERIFY_TIMEOUT)
+        except (DeviceOfflineError, KeyMismatchError, asyncio.TimeoutError, OSError, ValueError) as err:
+            _LOGGER.debug("Cannot read back %s from %s: %s", cols, client.host, err)
+            response = {}
+
+        applied = dict(zip(response.get("cols", ()), response.get("dat", ())))
+        cols = [col for col in cols if self._last_writes.get(col) == seq]
+        for col in cols:
+            del self._last_writes[col]
+        self.scheduler.request(col for col in cols if col not in applied)
+        applied = {col: applied[col] for col in cols if col in applied}
+
+        rejected = {col: value for col, value in applied.items() if value != values[col]}
+        if rejected:
+            self.command_mismatches += 1
+            requested = {col: values[col] for col in rejected}
+            _LOGGER.warning("Device %s did not apply %s, it reports %s", client.host, requested, rejected)
+            self.hass.bus.async_fire(EVENT_COMMAND_NOT_APPLIED, {
+                "host": client.host,
+                "device_id": client.device_id,
+                "requested": requested,
+                "applied": rejected,
+            })
+
+        if self.data is None:
+            return
+        changed = {col for col, value in applied.items() if self.data.get(col) != value}
+        if changed:
+            self._changed_cols = changed
+            self.async_set_updated_data({**self.data, **applied})
+
+    async def async_shutdown(self):
+        """Cancel pending verifications and stop polling."""
+        for task in self._verifications:
+            task.cancel()
+        await super().async_shutdown()
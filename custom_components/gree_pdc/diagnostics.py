@@ -0,0 +1,35 @@
+"""Diagnostics support for Gree PDC."""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_KEY
+
+TO_REDACT = {CONF_KEY}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return the transport statistics and last frame of a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    client = coordinator.client
+    breaker = client.breaker
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "client": client.stats.as_dict(),
+        "retransmission_timeout": client._rtt.rto,
+        "breaker": {
+            "open": breaker.is_open,
+            "failures": breaker.failures,
+        },
+        "poll": {
+            "interval": coordinator.update_interval.total_seconds(),
+            "last_update_success": coordinator.last_update_success,
+            "restored": coordinator.restored,
+            "failed_polls": coordinator.failed_polls,
+            "command_mismatches": coordinator.command_mismatches,
+            "duration": coordinator.poll_duration.as_dict(),
+        },
+        "request_gate": client.gate.stats(),
+        "spans": client.spans.as_dict(),
+        "data": coordinator.data,
+    }
@@ -0,0 +1,184 @@
+"""Discovery of Gree PDC devices on a network."""
+import asyncio
+import ipaddress
+import json
+import logging
+import socket
+
+from .const import DEFAULT_PORT, GENERIC_KEY, SCAN_REQUEST
+from .gree_api import PackCodec
+
+_LOGGER = logging.getLogger(__name__)
+
+DISCOVERY_TIMEOUT = 2
+# Unicast probes in flight at once, and how long each waits for its answer
+DISCOVERY_CONCURRENCY = 128
+PROBE_TIMEOUT = 0.5
+PROBE_ATTEMPTS = 2
+# Largest network scanned address by address: a /22
+MAX_DISCOVERY_HOSTS = 1024
+
+
+class _DiscoveryProtocol(asyncio.DatagramProtocol):
+    """Decode scan replies and hand each new device to the discovery run."""
+
+    def __init__(self, on_device):
+        self._on_device = on_device
+        self._codec = PackCodec(GENERIC_KEY)
+
+    def datagram_received(self, data, addr):
+        try:
+            resp = json.loads(data)
+            pack_json = json.loads(self._codec.decrypt(resp['pack']))
+        except (ValueError, KeyError, TypeError) as err:
+            _LOGGER.debug("Ignoring invalid scan reply from %s: %s", addr[0], err)
+            return
+
+        device_id = pack_json.get('cid') or resp.get('cid')
+        if device_id:
+            self._on_device({
+                "id": device_id,
+                "name": pack_json.get('name', 'Unknown Device'),
+                "host": addr[0],
+            })
+
+    def error_received(self, exc):
+        _LOGGER.debug("Discovery socket error: %s", exc)
+
+
+def parse_target(target):
+    """Return the IPv4 network to scan for ``target``.
+
+    Raises ValueError for anything but an IPv4 address or a network of at
+    most MAX_DISCOVERY_HOSTS addresses.
+    """
+    network = ipaddress.ip_network(target.strip(), strict=False)
+    if network.version != 4:
+        raise ValueError(f"{target} is not an IPv4 address or network")
+    if network.num_addresses > MAX_DISCOVERY_HOSTS:
+        raise ValueError(f"{target} has more than {MAX_DISCOVERY_HOSTS} addresses")
+    return network
+
+
+def _targets(target):
+    """Return the unicast hosts, their count and the broadcast address to probe for ``target``.
+
+    ``target`` is an IP address, a CIDR network or, as before, an address
+    ending in ``.255`` which is only broadcast to. The hosts are an iterator.
+    """
+    network = parse_target(target)
+    if network.num_addresses == 1:
+        address = str(network.network_address)
+        if address.endswith('.255'):
+            return iter(()), 0, address
+        return iter((address,)), 1, None
+    if network.prefixlen < 31:
+        return network.hosts(), network.num_addresses - 2, str(network.broadcast_address)
+    return network.hosts(), network.num_addresses, None
+
+
+async def async_discover(target, timeout=DISCOVERY_TIMEOUT, concurrency=DISCOVERY_CONCURRENCY,
+                         on_progress=None):
+    """Yield devices answering a scan of ``target`` as they are found.
+
+    Unicast addresses are probed concurrently by ``concurrency`` workers
+    taking them in turn, while the network broadcast address is probed as well. Replies are
+    deduplicated by cid. A single address stops as soon as it answers,
+    otherwise discovery lasts until every probe finished and ``timeout``
+    seconds passed. ``on_progress`` is called with the fraction of unicast
+    probes done.
+    """
+    hosts, count, broadcast = _targets(target)
+    _LOGGER.debug("Discovering devices at %s (%d hosts, broadcast %s)", target, count, broadcast)
+
+    loop = asyncio.get_running_loop()
+    found = asyncio.Queue()
+    answered = {}
+    seen = set()
+
+    def on_device(device):
+        if device["id"] in seen:
+            return
+        seen.add(device["id"])
+        event = answered.get(device["host"])
+        if event is not None:
+            event.set()
+        found.put_nowait(device)
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        sock.setblocking(False)
+        sock.bind(("0.0.0.0", 0))
+    except OSError:
+        sock.close()
+        raise
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: _DiscoveryProtocol(on_device), sock=sock
+    )
+
+    done = 0
+
+    async def probe(host):
+        event = answered[host] = asyncio.Event()
+        try:
+            for _ in range(PROBE_ATTEMPTS):
+                try:
+                    transport.sendto(SCAN_REQUEST, (host, DEFAULT_PORT))
+                except OSError as err:
+                    _LOGGER.debug("Cannot probe %s: %s", host, err)
+                    break
+                try:
+                    await asyncio.wait_for(event.wait(), PROBE_TIMEOUT)
+                    break
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            del answered[host]
+
+    async def worker():
+        nonlocal done
+        # The workers share the hosts iterator, so probes are created as
+        # they are needed
+        for host in hosts:
+            await probe(str(host))
+            done += 1
+            if on_progress is not None:
+                on_progress(done / count)
+
+    async def probe_all():
+        try:
+            if broadcast is not None:
+                transport.sendto(SCAN_REQUEST, (broadcast, DEFAULT_PORT))
+            await asyncio.gather(*(worker() for _ in range(min(concurrency, count))))
+        finally:
+            # Wake up the consumer, which then decides whether to keep listening
+            found.put_nowait(None)
+
+    deadline = loop.time() + timeout
+    prober = loop.create_task(probe_all())
+    try:
+        while True:
+            if prober.done():
+                if broadcast is None and count == 1 and seen:
+                    break
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+            else:
+                remaining = None
+            try:
+                device = await asyncio.wait_for(found.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if device is None:
+                await prober
+            else:
+                yield device
+        while not found.empty():
+            device = found.get_nowait()
+            if device is not None:
+                yield device
+    finally:
+        prober.cancel()
+        transport.close()
@@ -0,0 +1,33 @@
+"""Base entity of the Gree PDC platforms."""
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN, CONF_NAME, ATTR_RESTORED
+
+
+class GreePDCEntity(CoordinatorEntity):
+    """Entity of a Gree PDC unit, updated by the coordinator of its entry.
+
+    ``context`` is the set of columns the entity is computed from, see
+    GreePDCCoordinator. While the coordinator shows a restored frame not
+    yet confirmed by a poll, the state carries the ``restored`` attribute.
+    """
+
+    _attr_has_entity_name = True
+
+    def __init__(self, coordinator, entry, key, context=None):
+        super().__init__(coordinator, context=context)
+        self._entry_id = entry.entry_id
+        self._attr_unique_id = f"{entry.entry_id}_{key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.data.get(CONF_NAME, "Gree PDC"),
+            manufacturer="Gree",
+            model="Versati",
+        )
+
+    @property
+    def extra_state_attributes(self):
+        if self.coordinator.restored:
+            return {ATTR_RESTORED: True}
+        return None
@@ -0,0 +1,33 @@
+"""Significant-change filtering of the temperature sensors.
+
+Kept free of Home Assistant imports, like the client and the registers.
+"""
+from .const import (
+    CONF_SENSOR_FILTERS,
+    CONF_TEMP_DEADBAND,
+    CONF_TEMP_MIN_INTERVAL,
+    DEFAULT_TEMP_DEADBAND,
+    DEFAULT_TEMP_MIN_INTERVAL,
+)
+
+
+def exceeds_deadband(old, new, deadband):
+    """Return whether ``new`` moved by at least ``deadband`` from ``old``.
+
+    Compared in tenths, the resolution of the unit's temperatures: as
+    floats, 20.3 - 20.1 is just below 0.2.
+    """
+    return round(abs(new - old) * 10) >= round(deadband * 10)
+
+
+def sensor_filter(options, key):
+    """Return the (deadband, min_interval) of the temperature sensor ``key``.
+
+    A sensor's own settings in the options override the ones of all
+    temperature sensors.
+    """
+    own = options.get(CONF_SENSOR_FILTERS, {}).get(key, {})
+    return (
+        own.get(CONF_TEMP_DEADBAND, options.get(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND)),
+        own.get(CONF_TEMP_MIN_INTERVAL, options.get(CONF_TEMP_MIN_INTERVAL, DEFAULT_TEMP_MIN_INTERVAL)),
+    )
@@ -1,88 +1,315 @@
+import asyncio
 import base64
 import json
-import socket
+import random
 import logging
-import threading
-import time
+from dataclasses import dataclass
+from enum import Enum
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.backends import default_backend
 
 _LOGGER = logging.getLogger(__name__)
 
-from .const import GENERIC_KEY
+from .const import COMMAND_SLOTS, DEFAULT_PORT, GENERIC_KEY, REQUESTS_PER_DEVICE, SCAN_REQUEST
+from .metrics import ClientStats
+from .profiling import Spans
+from .transport import GreePDCEndpoint, RequestGate
+
+REQUEST_TIMEOUT = 3
+
+# Seconds the column sets of finished status requests are remembered, to
+# recognize late and duplicate replies to them
+STRAY_REPLY_WINDOW = REQUEST_TIMEOUT
+
+# Encrypted status requests kept per client, keyed by column set
+STATUS_REQUEST_CACHE = 16
+
+_PKCS7_PADDING = [bytes([n]) * n for n in range(17)]
+
+# Largest status response (bytes) a request is planned for: it fits an
+# Ethernet MTU, so replies are never IP-fragmented, which the Wi-Fi modules
+# of the units handle poorly. Larger column sets are split into chunks.
+MAX_RESPONSE_SIZE = 1400
+# Fixed parts of a status response pack and of its envelope (without the
+# cid/mac strings), and room reserved for one value and its separator
+_RESPONSE_PACK_OVERHEAD = len('{"t":"dat","mac":"","r":200,"cols":[],"dat":[]}')
+_RESPONSE_ENVELOPE_OVERHEAD = len('{"t":"pack","i":0,"uid":0,"cid":"","tcid":"","pack":""}')
+_VALUE_SIZE = 7
+
+# Retransmission interval bounds (seconds), see _RttEstimator
+INITIAL_RTO = 0.3
+MIN_RTO = 0.1
+MAX_RTO = 1.0
+
+# Command retry policy: attempts, per-attempt budget and exponential backoff
+COMMAND_ATTEMPTS = 5
+COMMAND_TIMEOUT = 2.0
+COMMAND_BACKOFF = 0.5
+COMMAND_MAX_BACKOFF = 4.0
+
+# Writes queued within this window (seconds) are sent as one cmd pack
+COALESCE_WINDOW = 0.075
+
+# Circuit breaker: consecutive failed requests before a device is considered
+# offline, seconds between liveness probes while it is, and their budget
+BREAKER_THRESHOLD = 3
+BREAKER_PROBE_INTERVAL = 30
+PROBE_TIMEOUT = 1.0
+# Polls at the probe interval may fire up to a second early, as the
+# coordinator aligns its timer to whole seconds; they still probe
+BREAKER_PROBE_TOLERANCE = 1.0
+
+# Consecutive replies the device key does not decode before the device is
+# considered re-paired, and the backoff (seconds) between failed re-binds
+KEY_MISMATCH_THRESHOLD = 3
+REBIND_BACKOFF = 10
+REBIND_MAX_BACKOFF = 600
+
+
+class DeviceOfflineError(Exception):
+    """The circuit breaker of the device is open, no request was sent."""
+
+
+class KeyMismatchError(Exception):
+    """The device answers with packs the stored key does not decrypt."""
+
+
+class CommandStatus(Enum):
+    """Final outcome of a command sent with async_set_values."""
+
+    ACKED = "acked"
+    REJECTED = "rejected"
+    TIMED_OUT = "timed_out"
+    ERROR = "error"
+    CANCELLED = "cancelled"
+    OFFLINE = "offline"
+
+
+@dataclass
+class CommandResult:
+    """Outcome of a command; truthy only when the device acknowledged it."""
+
+    status: CommandStatus
+    attempts: int = 0
+    code: int | None = None
+    error: str | None = None
+    values: dict | None = None
+
+    def __bool__(self):
+        return self.status is CommandStatus.ACKED
+
+
+def _match_bind(pack):
+    return pack.get("t", "").lower().startswith("bind")
+
+
+class _StatusMatcher:
+    """Match the status replies to a request for ``cols``.
+
+    Units leave the columns they do not know out of a reply, so a reply
+    with a subset of the columns matches too; exact() tells the replies
+    carrying exactly the requested columns apart.
+    """
+
+    __slots__ = ("cols",)
+
+    def __init__(self, cols):
+        self.cols = frozenset(cols)
+
+    def __call__(self, pack):
+        return pack.get("t") == "dat" and self.cols.issuperset(pack.get("cols") or ())
+
+    def exact(self, pack):
+        return self.cols == frozenset(pack.get("cols") or ())
+
+
+def _match_status(cols):
+    return _StatusMatcher(cols)
+
+
+def _match_command(opts):
+    wanted = list(opts)
+    return lambda pack: pack.get("t") == "res" and pack.get("opt") == wanted
+
+
+def _match_scan(pack):
+    return pack.get("t") == "dev"
+
+
+def _response_size(pack_size, mac_len):
+    """Return the datagram size of a response whose pack is ``pack_size`` bytes of JSON."""
+    encrypted = (pack_size // 16 + 1) * 16
+    return _RESPONSE_ENVELOPE_OVERHEAD + 2 * mac_len + 4 * -(-encrypted // 3)
+
+
+def plan_status_requests(cols, mac_len, limit=MAX_RESPONSE_SIZE):
+    """Split ``cols`` into chunks whose status responses fit in ``limit`` bytes.
+
+    The response size is estimated from the column names, the AES padding
+    and the base64 expansion, assuming every value takes _VALUE_SIZE bytes.
+    """
+    chunks = []
+    chunk = []
+    pack_size = _RESPONSE_PACK_OVERHEAD + mac_len
+    for col in cols:
+        col_size = len(col) + 3 + _VALUE_SIZE
+        if chunk and _response_size(pack_size + col_size, mac_len) > limit:
+            chunks.append(chunk)
+            chunk = []
+            pack_size = _RESPONSE_PACK_OVERHEAD + mac_len
+        chunk.append(col)
+        pack_size += col_size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+class _RttEstimator:
+    """Smoothed round-trip time of a device, driving retransmissions (RFC 6298)."""
+
+    def __init__(self):
+        self.srtt = None
+        self.rttvar = None
+        self.rto = INITIAL_RTO
+
+    def update(self, rtt):
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.rto = min(MAX_RTO, max(MIN_RTO, self.srtt + 4 * self.rttvar))
+
+
+class CircuitBreaker:
+    """Track whether a device answers, to stop spending timeouts on it when not.
+
+    After ``threshold`` consecutive failed requests the breaker opens: the
+    client fails fast and only sends a cheap liveness probe every
+    ``probe_interval`` seconds. The first answered request closes it again.
+    """
+
+    def __init__(self, host, threshold=BREAKER_THRESHOLD, probe_interval=BREAKER_PROBE_INTERVAL):
+        self.host = host
+        self.threshold = threshold
+        self.probe_interval = probe_interval
+        self.failures = 0
+        self.opened_at = None
+        self._last_probe = None
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+    def record_success(self):
+        if self.is_open:
+            _LOGGER.info("Device %s is reachable again", self.host)
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self, now):
+        self.failures += 1
+        if not self.is_open and self.failures >= self.threshold:
+            _LOGGER.warning(
+                "Device %s did not answer %d requests in a row, probing it every %ss until it does",
+                self.host, self.failures, self.probe_interval,
+            )
+            self.opened_at = self._last_probe = now
+
+    def probe_due(self, now):
+        """Return True, once per probe interval, while the breaker is open."""
+        if now - self._last_probe < self.probe_interval - BREAKER_PROBE_TOLERANCE:
+            return False
+        self._last_probe = now
+        return True
+
+
+class _CommandBatch:
+    """Writes collected during one coalescing window and their shared outcome."""
+
+    __slots__ = ("values", "future", "handle")
+
+    def __init__(self, future, handle):
+        self.values = {}
+        self.future = future
+        self.handle = handle
+
+
+class _PendingRequest:
+    """A request in flight, waiting for the response pack it matches."""
+
+    __slots__ = ("key", "matcher", "future")
+
+    def __init__(self, key, matcher, future):
+        self.key = key
+        self.matcher = matcher
+        self.future = future
+
+
+class PackCodec:
+    """AES-128-ECB and base64 codec of Gree packs for one key.
+
+    ECB keeps no state between blocks, so one encryptor and one decryptor
+    context are created per key and fed whole blocks for their lifetime.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        cipher = Cipher(algorithms.AES(key.encode('utf-8')), modes.ECB())
+        self._encryptor = cipher.encryptor()
+        self._decryptor = cipher.decryptor()
+
+    def encrypt(self, plain):
+        """PKCS7-pad and encrypt ``plain`` (bytes-like), returning base64 bytes."""
+        padded = b"".join((plain, _PKCS7_PADDING[16 - len(plain) % 16]))
+        return base64.b64encode(self._encryptor.update(padded))
+
+    def decrypt(self, encoded):
+        """Decrypt a base64 pack (str or bytes-like) and return the unpadded bytes."""
+        data = base64.b64decode(encoded)
+        if not data or len(data) % 16:
+            raise ValueError("Pack is not a whole number of AES blocks")
+        plain = self._decryptor.update(data)
+        pad = plain[-1]
+        if 0 < pad <= 16 and plain.endswith(_PKCS7_PADDING[pad]):
+            return plain[:-pad]
+        # Not PKCS7 padded: cut after the closing brace of the JSON object
+        end = plain.rfind(b'}')
+        if end < 0:
+            raise ValueError("Pack does not decrypt to a JSON object")
+        return plain[:end + 1]
+
 
 class GreePDCClient:
     @staticmethod
     def scan(host, timeout=2):
-        """Scan for devices at the given host (can be a specific IP or broadcast)."""
-        devices = []
-        _LOGGER.debug("Scanning for devices at %s", host)
-        s = socket.socket(type=socket.SOCK_DGRAM, proto=socket.IPPROTO_UDP)
-        s.settimeout(timeout)
-        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        if host.endswith('.255'):
-            s.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-            
+        """Scan for devices at the given host (an IP, a CIDR network or a broadcast address)."""
+        from .discovery import async_discover
+
+        async def collect():
+            return [device async for device in async_discover(host, timeout)]
+
         try:
-            s.sendto(b'{"t":"scan"}', (host, 7000))
-            while True:
-                try:
-                    data, addr = s.recvfrom(2048)
-                    resp = json.loads(data.decode('utf-8'))
-                    # We need a temporary client to decrypt the pack
-                    temp_client = GreePDCClient(addr[0], "", "")
-                    pack_decrypted = temp_client._decrypt(resp['pack'], GENERIC_KEY)
-                    pack_json = json.loads(pack_decrypted)
-                    
-                    device_id = pack_json.get('cid') or resp.get('cid')
-                    name = pack_json.get('name', 'Unknown Device')
-                    
-                    if device_id:
-                        devices.append({
-                            "id": device_id,
-                            "name": name,
-                            "host": addr[0]
-                        })
-                    if not host.endswith('.255'): # If it's a specific IP, we probably only want one
-                        break
-                except socket.timeout:
-                    break
+            return asyncio.run(collect())
         except Exception as e:
             _LOGGER.error("Scan failed for %s: %s", host, e)
-        finally:
-            s.close()
-        return devices
+            return []
 
     def bind(self):
+        """Bind to the device to get the specific encryption key."""
+        return self._run_sync(self.async_bind())
+
+    async def async_bind(self):
         """Bind to the device to get the specific encryption key."""
         _LOGGER.debug("Binding to device %s at %s", self.device_id, self.host)
         bind_pack = f'{{"mac":"{self.device_id}","t":"bind","uid":0}}'
-        bind_pack_encrypted = self._encrypt(bind_pack, GENERIC_KEY)
-        
-        bind_request = {
-            "cid": "app",
-            "i": 1,
-            "pack": bind_pack_encrypted,
-            "t": "pack",
-            "tcid": self.device_id,
-            "uid": 0
-        }
-        
         try:
-            bind_resp_str = self._send_data(json.dumps(bind_request))
-            bind_resp = json.loads(bind_resp_str)
-            
-            if bind_resp.get("t") == "pack":
-                bind_pack_decrypted = self._decrypt(bind_resp["pack"], GENERIC_KEY)
-                bind_result = json.loads(bind_pack_decrypted)
-                
-                if bind_result.get("t", "").lower() == "bindok":
-                    self.device_key = bind_result["key"]
-                    return True
-                else:
-                    _LOGGER.error("Binding failed for %s: %s", self.host, bind_result)
-            else:
-                _LOGGER.error("Unexpected binding response for %s: %s", self.host, bind_resp)
+            request = self._build_request(bind_pack, GENERIC_KEY, i=1)
+            bind_result = await self._async_request(request, GENERIC_KEY, _match_bind)
+            if bind_result.get("t", "").lower() == "bindok":
+                self.device_key = bind_result["key"]
+                return True
+            _LOGGER.error("Binding failed for %s: %s", self.host, bind_result)
         except Exception as e:
             _LOGGER.error("Binding failed for %s: %s", self.host, e)
             
@@ -92,72 +319,463 @@ class GreePDCClient:
         self.host = host
         self.device_id = device_id
         self.device_key = device_key
-        self.port = 7000
-        self._lock = threading.Lock()
-
-    def _add_pkcs7_padding(self, data):
-        length = 16 - (len(data) % 16)
-        padded = data + chr(length) * length
-        return padded
-
-    def _create_cipher(self, key):
-        return Cipher(algorithms.AES(key.encode('utf-8')), modes.ECB(), backend=default_backend())
-
-    def _encrypt(self, pack, key):
-        encryptor = self._create_cipher(key).encryptor()
-        pack_padded = self._add_pkcs7_padding(pack)
-        pack_encrypted = encryptor.update(bytes(pack_padded, encoding='utf-8')) + encryptor.finalize()
-        pack_encoded = base64.b64encode(pack_encrypted)
-        return pack_encoded.decode('utf-8')
-
-    def _decrypt(self, pack_encoded, key):
-        decryptor = self._create_cipher(key).decryptor()
-        pack_decoded = base64.b64decode(pack_encoded)
-        pack_decrypted = decryptor.update(pack_decoded) + decryptor.finalize()
-        pack_unpadded = pack_decrypted[0:pack_decrypted.rfind(b'}') + 1]
-        return pack_unpadded.decode('utf-8')
-
-    def _send_data(self, data):
-        with self._lock:
-            s = socket.socket(type=socket.SOCK_DGRAM, proto=socket.IPPROTO_UDP)
-            s.settimeout(3)
+        # Called with the new key when the device was bound again
+        self.on_key_change = None
+        # Called once with the values of every acknowledged queued command
+        self.on_command_acked = None
+        self.key_mismatch = False
+        self._undecodable = 0
+        self._rebind_lock = asyncio.Lock()
+        self._rebind_after = 0
+        self._rebind_backoff = REBIND_BACKOFF
+        self.port = DEFAULT_PORT
+        # Requests in flight to this device, one slot kept for commands
+        self.gate = RequestGate(REQUESTS_PER_DEVICE + COMMAND_SLOTS, reserved=COMMAND_SLOTS)
+        self._endpoint = None
+        self._pending = []
+        self._rtt = _RttEstimator()
+        self.breaker = CircuitBreaker(host)
+        self.stats = ClientStats()
+        self.spans = Spans()
+        self._commands = set()
+        self._batch = None
+        self._codecs = {}
+        self._status_requests = {}
+        self._request_plans = {}
+        # Column set of a recent status reply -> (columns of the request it
+        # answered, expiry)
+        self._recent_status = {}
+        # Constant parts of the request envelope, rendered once
+        self._envelope_heads = (b'{"cid":"app","i":0,"pack":"', b'{"cid":"app","i":1,"pack":"')
+        self._envelope_tail = f'","t":"pack","tcid":{json.dumps(device_id)},"uid":0}}'.encode('utf-8')
+
+    def _codec(self, key):
+        codec = self._codecs.get(key)
+        if codec is None:
+            codec = self._codecs[key] = PackCodec(key)
+        return codec
+
+    def _build_request(self, pack, key, i=0):
+        """Return the datagram carrying ``pack`` (str or bytes) encrypted with ``key``."""
+        if isinstance(pack, str):
+            pack = pack.encode('utf-8')
+        return b"".join((self._envelope_heads[i], self._codec(key).encrypt(pack), self._envelope_tail))
+
+    def _decode_pack(self, pack_encoded, key):
+        """Decrypt and parse the pack of a response envelope."""
+        with self.spans.span("decrypt"):
+            plain = self._codec(key).decrypt(pack_encoded)
+        with self.spans.span("json"):
+            return json.loads(plain)
+
+    def _status_pack(self, cols):
+        cols_str = ','.join(f'"{c}"' for c in cols)
+        return f'{{"cols":[{cols_str}],"mac":"{self.device_id}","t":"status"}}'
+
+    def _status_request(self, cols):
+        """Return the encrypted status request for ``cols``, reusing earlier ones.
+
+        ECB is deterministic, so the datagram for a column set never changes
+        while the key stays the same.
+        """
+        cache_key = (tuple(cols), self.device_key)
+        request = self._status_requests.get(cache_key)
+        if request is None:
+            if len(self._status_requests) >= STATUS_REQUEST_CACHE:
+                self._status_requests.clear()
+            with self.spans.span("encrypt"):
+                request = self._build_request(self._status_pack(cols), self.device_key)
+            self._status_requests[cache_key] = request
+        return request
+
+    def _run_sync(self, coro):
+        """Run a client coroutine to completion from a worker thread."""
+        async def runner():
             try:
-                s.sendto(data.encode('utf-8'), (self.host, self.port))
-                response, _ = s.recvfrom(2048)
-                return response.decode('utf-8')
-            except socket.timeout:
-                _LOGGER.error("Timeout (3s) sending data to %s", self.host)
-                raise
-            except Exception as e:
+                return await coro
+            finally:
+                self.close()
+        return asyncio.run(runner())
+
+    async def _async_get_endpoint(self):
+        if self._endpoint is None:
+            self._endpoint = await GreePDCEndpoint.async_acquire()
+            self._endpoint.register(self.host, self.device_id, self._handle_response)
+        else:
+            await self._endpoint.async_open()
+        return self._endpoint
+
+    def _handle_response(self, response):
+        """Deliver a response to the oldest in-flight request it matches.
+
+        A status reply goes to the oldest request for exactly its columns.
+        Only when there is none does it go to the oldest request for more
+        columns (the unit left unknown ones out), and never when it has the
+        columns of a different request that finished recently: it is then a
+        late or duplicate reply to that request.
+        """
+        if isinstance(response, Exception):
+            for pending in self._pending:
+                if not pending.future.done():
+                    pending.future.set_exception(response)
+            return
+        if response.get("t") != "pack" or "pack" not in response:
+            _LOGGER.debug("Discarding unexpected response from %s: %s", self.host, response)
+            return
+
+        decoded = {}
+        partial = None
+        for pending in self._pending:
+            if pending.future.done():
+                continue
+            if pending.key not in decoded:
+                try:
+                    decoded[pending.key] = self._decode_pack(response["pack"], pending.key)
+                except ValueError:
+                    self.stats.decode_failures += 1
+                    decoded[pending.key] = None
+            pack = decoded[pending.key]
+            if not isinstance(pack, dict) or not pending.matcher(pack):
+                continue
+            exact = getattr(pending.matcher, "exact", None)
+            if exact is None or exact(pack):
+                self._deliver(pending, pack)
+                return
+            if partial is None and not self._is_stray(pack, pending.matcher.cols):
+                partial = pending
+        if partial is not None:
+            self._deliver(partial, decoded[partial.key])
+            return
+        if self.device_key in decoded and not isinstance(decoded[self.device_key], dict):
+            self._record_undecodable()
+        _LOGGER.debug("Discarding unmatched response from %s", self.host)
+
+    def _deliver(self, pending, pack):
+        if pending.key == self.device_key:
+            self._undecodable = 0
+        if isinstance(pending.matcher, _StatusMatcher):
+            self._remember_status(frozenset(pack.get("cols") or ()), pending.matcher.cols)
+        pending.future.set_result(pack)
+
+    def _remember_status(self, reply_cols, request_cols):
+        now = asyncio.get_running_loop().time()
+        recent = self._recent_status
+        for cols in [cols for cols, (_, expiry) in recent.items() if expiry <= now]:
+            del recent[cols]
+        recent[reply_cols] = (request_cols, now + STRAY_REPLY_WINDOW)
+
+    def _is_stray(self, pack, request_cols):
+        """Return whether a status reply answers a recent request for other columns."""
+        recent = self._recent_status.get(frozenset(pack.get("cols") or ()))
+        return (
+            recent is not None
+            and recent[0] != request_cols
+            and recent[1] > asyncio.get_running_loop().time()
+        )
+
+    def _record_undecodable(self):
+        """Count a reply the device key does not decode, flagging a key mismatch.
+
+        Once flagged, the requests waiting for a reply under the device key
+        fail with KeyMismatchError instead of running into their timeout.
+        """
+        self._undecodable += 1
+        if self.key_mismatch or self._undecodable < KEY_MISMATCH_THRESHOLD:
+            return
+        _LOGGER.warning("Device %s answers with packs its key does not decrypt, binding it again", self.host)
+        self.key_mismatch = True
+        for pending in self._pending:
+            if pending.key == self.device_key and not pending.future.done():
+                pending.future.set_exception(KeyMismatchError(f"Device {self.host} does not use the stored key"))
+
+    async def _async_rebind(self):
+        """Bind the device again after a key mismatch; return whether its key is usable.
+
+        Failed attempts back off exponentially from REBIND_BACKOFF to
+        REBIND_MAX_BACKOFF seconds; in between, this returns False at once.
+        A new key is passed to ``on_key_change``.
+        """
+        async with self._rebind_lock:
+            if not self.key_mismatch:
+                return True
+            loop = asyncio.get_running_loop()
+            if loop.time() < self._rebind_after:
+                return False
+            old_key = self.device_key
+            if not await self.async_bind():
+                self._rebind_after = loop.time() + self._rebind_backoff
+                self._rebind_backoff = min(REBIND_MAX_BACKOFF, self._rebind_backoff * 2)
+                return False
+
+            self.stats.rebinds += 1
+            self.key_mismatch = False
+            self._undecodable = 0
+            self._rebind_after = 0
+            self._rebind_backoff = REBIND_BACKOFF
+            if self.device_key != old_key:
+                _LOGGER.info("Device %s bound again with a new key", self.host)
+                if self.on_key_change is not None:
+                    self.on_key_change(self.device_key)
+            return True
+
+    def close(self):
+        """Cancel running commands and release the shared UDP endpoint."""
+        if self._batch is not None:
+            self._batch.handle.cancel()
+            if not self._batch.future.done():
+                self._batch.future.set_result(CommandResult(CommandStatus.CANCELLED))
+            self._batch = None
+        for task in self._commands:
+            task.cancel()
+        self.gate.close()
+        if self._endpoint is not None:
+            self._endpoint.unregister(self.host, self.device_id, self._handle_response)
+            self._endpoint.release()
+            self._endpoint = None
+
+    async def _async_request(self, request, key, matcher, timeout=REQUEST_TIMEOUT, command=False):
+        """Send a request datagram and wait for the response pack it matches.
+
+        ``key`` is the key the response pack is encrypted with.
+
+        Requests are not serialized: several can be in flight for the same
+        device and each response is matched by type and columns, so a command
+        does not queue behind a status poll.
+
+        ``timeout`` is the total budget of the request. Within it the same
+        datagram is retransmitted at an interval derived from the measured
+        round-trip time, doubling after every loss, so a dropped packet costs
+        a few hundred milliseconds instead of the whole budget. Time spent
+        waiting for a slot of ``gate`` is not part of the budget; a
+        ``command`` may take the slot reserved for commands.
+        """
+        async with self.gate.slot(command):
+            with self.spans.span("round_trip"):
+                return await self._async_send_request(request, key, matcher, timeout)
+
+    async def _async_send_request(self, request, key, matcher, timeout):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        endpoint = await self._async_get_endpoint()
+        pending = _PendingRequest(key, matcher, loop.create_future())
+        self._pending.append(pending)
+        stats = self.stats
+        stats.requests += 1
+        try:
+            interval = self._rtt.rto
+            transmissions = 0
+            while True:
+                sent_at = loop.time()
+                remaining = deadline - sent_at
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                if transmissions:
+                    stats.retransmissions += 1
+                    _LOGGER.debug("Retransmitting to %s (attempt %d)", self.host, transmissions + 1)
+                endpoint.sendto(request, (self.host, self.port))
+                transmissions += 1
+                done, _ = await asyncio.wait((pending.future,), timeout=min(interval, remaining))
+                if done:
+                    if transmissions == 1:
+                        rtt = loop.time() - sent_at
+                        self._rtt.update(rtt)
+                        stats.rtt.record(rtt)
+                        stats.recent_rtt.record(rtt)
+                    response = pending.future.result()
+                    self.breaker.record_success()
+                    return response
+                interval = min(interval * 2, MAX_RTO)
+        except KeyMismatchError:
+            # The device did answer
+            self.breaker.record_success()
+            raise
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            self.breaker.record_failure(loop.time())
+            if not self.breaker.is_open:
+                _LOGGER.warning("Timeout (%ss) sending data to %s", timeout, self.host)
+            raise
+        except OSError as e:
+            stats.errors += 1
+            self.breaker.record_failure(loop.time())
+            if not self.breaker.is_open:
                 _LOGGER.error("Error sending data to %s: %s", self.host, e)
+            raise
+        except Exception as e:
+            _LOGGER.error("Error sending data to %s: %s", self.host, e)
+            raise
+        finally:
+            self._pending.remove(pending)
+            if isinstance(matcher, _StatusMatcher):
+                self._remember_status(matcher.cols, matcher.cols)
+            if not pending.future.done():
+                pending.future.cancel()
+
+    async def async_probe(self):
+        """Check with a unicast scan whether the device answers at all."""
+        try:
+            await self._async_request(SCAN_REQUEST, GENERIC_KEY, _match_scan, timeout=PROBE_TIMEOUT)
+        except (asyncio.TimeoutError, OSError):
+            return False
+        return True
+
+    async def _async_available(self):
+        """Return whether requests may be sent, probing an offline device when due.
+
+        After a key mismatch the device is bound again first.
+        """
+        if self.key_mismatch and not await self._async_rebind():
+            return False
+        if not self.breaker.is_open:
+            return True
+        if not self.breaker.probe_due(asyncio.get_running_loop().time()):
+            return False
+        _LOGGER.debug("Probing offline device %s", self.host)
+        return await self.async_probe()
+
+    def get_values(self, cols, timeout=REQUEST_TIMEOUT):
+        return self._run_sync(self.async_get_values(cols, timeout))
+
+    def _request_plan(self, cols):
+        """Return the chunks ``cols`` are requested in, see plan_status_requests."""
+        cache_key = tuple(cols)
+        plan = self._request_plans.get(cache_key)
+        if plan is None:
+            if len(self._request_plans) >= STATUS_REQUEST_CACHE:
+                self._request_plans.clear()
+            plan = self._request_plans[cache_key] = plan_status_requests(cols, len(self.device_id))
+        return plan
+
+    async def async_get_values(self, cols, timeout=REQUEST_TIMEOUT):
+        """Read ``cols`` from the device within a total budget of ``timeout`` seconds.
+
+        Column sets whose response would not fit in MAX_RESPONSE_SIZE are
+        requested in chunks, all in flight at once, and merged into one
+        pack. Chunks that fail are left out of it; only when every chunk
+        fails is the error raised.
+
+        Raises DeviceOfflineError without sending anything while the circuit
+        breaker of the device is open and no probe brought it back.
+
+        When the replies show the device was re-paired with a new key, the
+        device is bound again and the read repeated once. Raises
+        KeyMismatchError while binding it fails.
+        """
+        try:
+            return await self._async_read(cols, timeout)
+        except KeyMismatchError:
+            if not await self._async_rebind():
                 raise
-            finally:
-                s.close()
+        return await self._async_read(cols, timeout)
 
-    def get_values(self, cols):
-        cols_str = ','.join(f'"{c}"' for c in cols)
-        pack = f'{{"cols":[{cols_str}],"mac":"{self.device_id}","t":"status"}}'
-        pack_encrypted = self._encrypt(pack, self.device_key)
-        
-        _LOGGER.debug("Sending status request to %s for %d columns", self.host, len(cols))
-        request = {
-            "cid": "app",
-            "i": 0,
-            "pack": pack_encrypted,
-            "t": "pack",
-            "tcid": self.device_id,
-            "uid": 0
-        }
-        
-        response_str = self._send_data(json.dumps(request))
-        response = json.loads(response_str)
-        
-        if response.get("t") == "pack":
-            pack_decrypted = self._decrypt(response["pack"], self.device_key)
-            return json.loads(pack_decrypted)
-        return None
+    async def _async_read(self, cols, timeout):
+        if not await self._async_available():
+            if self.key_mismatch:
+                raise KeyMismatchError(f"Device {self.host} does not use the stored key and cannot be bound")
+            raise DeviceOfflineError(f"Device {self.host} is offline")
+        plan = self._request_plan(cols)
+        if len(plan) == 1:
+            _LOGGER.debug("Sending status request to %s for %d columns", self.host, len(cols))
+            return await self._async_get_chunk(cols, timeout)
+
+        _LOGGER.debug("Sending status request to %s for %d columns in %d chunks", self.host, len(cols), len(plan))
+        responses = await asyncio.gather(
+            *(self._async_get_chunk(chunk, timeout) for chunk in plan), return_exceptions=True
+        )
+        merged = {"t": "dat", "mac": self.device_id, "r": 200, "cols": [], "dat": []}
+        errors = []
+        for response in responses:
+            if isinstance(response, BaseException):
+                errors.append(response)
+                continue
+            merged["cols"].extend(response.get("cols", ()))
+            merged["dat"].extend(response.get("dat", ()))
+        if len(errors) == len(plan):
+            raise errors[0]
+        if errors:
+            _LOGGER.debug("%d of %d status chunks failed for %s", len(errors), len(plan), self.host)
+        return merged
+
+    async def _async_get_chunk(self, cols, timeout):
+        request = self._status_request(cols)
+        return await self._async_request(request, self.device_key, _match_status(cols), timeout=timeout)
+
+    async def async_probe_columns(self, cols, batch_size):
+        """Return the columns among ``cols`` the device returns values for.
+
+        The columns are requested ``batch_size`` at a time, one batch after
+        the other so that replies leaving every column out stay unambiguous.
+        """
+        supported = set()
+        for start in range(0, len(cols), batch_size):
+            response = await self.async_get_values(cols[start:start + batch_size])
+            supported.update(
+                col for col, value in zip(response.get("cols", ()), response.get("dat", ()))
+                if value is not None and value != ""
+            )
+        return supported
 
     def set_values(self, values_dict):
+        return self._run_sync(self.async_set_values(values_dict))
+
+    async def async_set_values(self, values_dict):
+        """Send a command, retrying with backoff until it is acknowledged or rejected.
+
+        The retries run in a task owned by the client, so close() cancels
+        them when the entry is unloaded. Returns a CommandResult.
+        """
+        task = asyncio.get_running_loop().create_task(self._async_run_command(values_dict))
+        self._commands.add(task)
+        task.add_done_callback(self._commands.discard)
+        try:
+            with self.spans.span("command"):
+                return await task
+        except asyncio.CancelledError:
+            if task.cancelled() and not asyncio.current_task().cancelling():
+                _LOGGER.debug("Command to %s cancelled: %s", self.host, values_dict)
+                return CommandResult(CommandStatus.CANCELLED)
+            raise
+
+    async def async_queue_values(self, values_dict):
+        """Queue a write and send it together with others from the same window.
+
+        Writes arriving within COALESCE_WINDOW of the first one are merged
+        into a single cmd pack, later values for the same column winning.
+        Every caller gets the CommandResult of the combined command, whose
+        ``values`` hold what was actually sent. When the device acknowledges
+        it, ``on_command_acked`` is called with those values once, before
+        the callers resume.
+        """
+        loop = asyncio.get_running_loop()
+        if self._batch is None:
+            self._batch = _CommandBatch(
+                loop.create_future(), loop.call_later(COALESCE_WINDOW, self._flush_batch)
+            )
+        self._batch.values.update(values_dict)
+        return await asyncio.shield(self._batch.future)
+
+    def _flush_batch(self):
+        batch, self._batch = self._batch, None
+        if len(batch.values) > 1:
+            _LOGGER.debug("Coalesced writes to %s into one command: %s", self.host, batch.values)
+        task = asyncio.get_running_loop().create_task(self.async_set_values(batch.values))
+
+        def resolve(task):
+            if batch.future.done():
+                return
+            if task.cancelled():
+                batch.future.set_result(CommandResult(CommandStatus.CANCELLED))
+            elif task.exception() is not None:
+                batch.future.set_exception(task.exception())
+            else:
+                result = task.result()
+                if result and self.on_command_acked is not None:
+                    self.on_command_acked(result.values)
+                batch.future.set_result(result)
+
+        task.add_done_callback(resolve)
+
+    async def _async_run_command(self, values_dict):
         opts = list(values_dict.keys())
         ps = list(values_dict.values())
         
@@ -165,44 +783,47 @@ class GreePDCClient:
         ps_str = ','.join(str(p) for p in ps)
         
         pack = f'{{"opt":[{opts_str}],"p":[{ps_str}],"t":"cmd"}}'
-        pack_encrypted = self._encrypt(pack, self.device_key)
-        
-        request_obj = {
-            "cid": "app",
-            "i": 0,
-            "pack": pack_encrypted,
-            "t": "pack",
-            "tcid": self.device_id,
-            "uid": 0
-        }
-        request_str = json.dumps(request_obj)
-
-        for attempt in range(6):  # Initial attempt + up to 5 retries
-            if attempt > 0:
-                _LOGGER.debug("Retrying command to %s (retry %d/5)", self.host, attempt)
-            else:
-                _LOGGER.debug("Sending command to %s: %s", self.host, values_dict)
-                
+        key = request = None
+        matcher = _match_command(opts)
+        _LOGGER.debug("Sending command to %s: %s", self.host, values_dict)
+
+        self.stats.commands += 1
+        result = None
+        for attempt in range(1, COMMAND_ATTEMPTS + 1):
+            if not await self._async_available():
+                _LOGGER.debug("Not sending command to offline device %s: %s", self.host, values_dict)
+                self.stats.command_failures += 1
+                return CommandResult(CommandStatus.OFFLINE, attempt - 1, values=values_dict)
+            if attempt > 1:
+                # Full jitter keeps several automations hitting the same unit apart
+                backoff = min(COMMAND_MAX_BACKOFF, COMMAND_BACKOFF * 2 ** (attempt - 2))
+                await asyncio.sleep(random.uniform(0, backoff))
+                self.stats.command_retries += 1
+                _LOGGER.debug("Retrying command to %s (retry %d/%d)", self.host, attempt - 1, COMMAND_ATTEMPTS - 1)
+
+            if key != self.device_key:
+                # Built again when the device was bound again in between
+                key = self.device_key
+                with self.spans.span("encrypt"):
+                    request = self._build_request(pack, key)
             try:
-                response_str = self._send_data(request_str)
-                response = json.loads(response_str)
-                
-                if response.get("t") == "pack":
-                    pack_decrypted = self._decrypt(response["pack"], self.device_key)
-                    result = json.loads(pack_decrypted)
-                    success = result.get("r") == 200
-                    if success:
-                        _LOGGER.debug("Command successful on %s", self.host)
-                        return True
-                    else:
-                        _LOGGER.error("Command failed on %s (attempt %d): %s", self.host, attempt + 1, result)
-                else:
-                    _LOGGER.error("Unexpected response from %s (attempt %d): %s", self.host, attempt + 1, response)
-            except Exception as e:
-                _LOGGER.error("Error sending command to %s (attempt %d): %s", self.host, attempt + 1, e)
-            
-            if attempt < 5:
-                time.sleep(1)
-        
-        _LOGGER.error("Command failed on %s after 5 retries", self.host)
-        return False
+                response = await self._async_request(request, key, matcher, timeout=COMMAND_TIMEOUT, command=True)
+            except asyncio.TimeoutError:
+                self.stats.command_timeouts += 1
+                result = CommandResult(CommandStatus.TIMED_OUT, attempt, values=values_dict)
+                continue
+            except (OSError, ValueError, KeyMismatchError) as e:
+                result = CommandResult(CommandStatus.ERROR, attempt, error=str(e), values=values_dict)
+                continue
+
+            if response.get("r") == 200:
+                _LOGGER.debug("Command successful on %s", self.host)
+                return CommandResult(CommandStatus.ACKED, attempt, 200, values=values_dict)
+            # A rejection is the device's answer, not a loss: retrying would not change it
+            self.stats.command_failures += 1
+            _LOGGER.error("Command rejected by %s: %s", self.host, response)
+            return CommandResult(CommandStatus.REJECTED, attempt, response.get("r"), values=values_dict)
+
+        self.stats.command_failures += 1
+        _LOGGER.error("Command failed on %s after %d attempts: %s", self.host, COMMAND_ATTEMPTS, result.status.value)
+        return result
@@ -0,0 +1,112 @@
+"""In-memory history of raw Gree PDC frames."""
+import struct
+import sys
+from array import array
+
+# Stored for columns missing from a frame or holding a non-integer value
+MISSING = -(2 ** 31)
+
+BINARY_MAGIC = b"GPDCHIST"
+BINARY_VERSION = 1
+
+
+class FrameHistory:
+    """Fixed-size ring buffer of raw column frames.
+
+    Every frame is a timestamp (seconds since the epoch) and one 32-bit
+    integer per column, in ``columns`` order. Timestamps and values live in
+    two flat arrays allocated up front, so recording a frame creates no
+    Python objects and the memory use is constant:
+    ``capacity * (8 + 4 * len(columns))`` bytes.
+    """
+
+    def __init__(self, columns, capacity):
+        self.columns = tuple(columns)
+        self.capacity = capacity
+        self._width = len(self.columns)
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._values = array("i", bytes(4 * capacity * self._width))
+        self._next = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def copy(self):
+        """Return an independent copy, e.g. to export it outside the event loop."""
+        other = FrameHistory.__new__(FrameHistory)
+        other.columns = self.columns
+        other.capacity = self.capacity
+        other._width = self._width
+        other._timestamps = array("d", self._timestamps)
+        other._values = array("i", self._values)
+        other._next = self._next
+        other._size = self._size
+        return other
+
+    def append(self, timestamp, data):
+        """Record the values of ``data`` (a column -> value dict) at ``timestamp``."""
+        index = self._next
+        self._timestamps[index] = timestamp
+        offset = index * self._width
+        values = self._values
+        for position, col in enumerate(self.columns):
+            value = data.get(col)
+            values[offset + position] = (
+                value if type(value) is int and MISSING < value < 2 ** 31 else MISSING
+            )
+        self._next = (index + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def _indexes(self, start=None, end=None):
+        """Return the ring indexes of the frames in [start, end], oldest first."""
+        first = (self._next - self._size) % self.capacity
+        timestamps = self._timestamps
+        return [
+            index for index in (
+                (first + offset) % self.capacity for offset in range(self._size)
+            )
+            if (start is None or timestamps[index] >= start)
+            and (end is None or timestamps[index] <= end)
+        ]
+
+    def frames(self, start=None, end=None):
+        """Yield (timestamp, values) of the frames in [start, end], oldest first.
+
+        Missing values are None.
+        """
+        width = self._width
+        for index in self._indexes(start, end):
+            row = self._values[index * width:(index + 1) * width]
+            yield self._timestamps[index], [None if value == MISSING else value for value in row]
+
+    def to_csv(self, start=None, end=None):
+        """Return the frames in [start, end] as CSV text, with a header row."""
+        lines = [",".join(("timestamp",) + self.columns)]
+        for timestamp, row in self.frames(start, end):
+            lines.append(",".join([f"{timestamp:.3f}"] + ["" if v is None else str(v) for v in row]))
+        return "\n".join(lines) + "\n"
+
+    def to_binary(self, start=None, end=None):
+        """Return the frames in [start, end] in the compact binary format.
+
+        Little-endian layout: the 8-byte magic ``GPDCHIST``, a uint16 format
+        version, a uint16 column count and a uint32 frame count, then the
+        column names as comma-separated UTF-8 prefixed by their uint32
+        length, then one record per frame: a float64 timestamp followed by
+        one int32 per column, -2**31 meaning missing.
+        """
+        indexes = self._indexes(start, end)
+        names = ",".join(self.columns).encode("utf-8")
+        header = BINARY_MAGIC + struct.pack(
+            "<HHII", BINARY_VERSION, self._width, len(indexes), len(names)
+        ) + names
+        width = self._width
+        body = bytearray()
+        for index in indexes:
+            row = self._values[index * width:(index + 1) * width]
+            if sys.byteorder == "big":
+                row.byteswap()
+            body += struct.pack("<d", self._timestamps[index])
+            body += row.tobytes()
+        return header + bytes(body)
@@ -0,0 +1,133 @@
+"""Transport statistics of Gree PDC devices."""
+from bisect import bisect_left
+from collections import deque
+
+# Upper bounds (milliseconds) of the latency histogram buckets
+LATENCY_BUCKETS = (5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# Round trips covered by the recent round-trip times shown by the entities:
+# about half an hour of polls at the default interval
+RECENT_RTT_SAMPLES = 256
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations, cheap enough to record every request."""
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.last = None
+
+    def record(self, seconds):
+        value = seconds * 1000
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+        self.last = value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def percentile(self, point):
+        """Estimate the ``point`` percentile (ms), interpolating inside its bucket."""
+        if not self.count:
+            return None
+        rank = max(1, -(-self.count * point // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if seen + count >= rank:
+                if index == len(self.bounds):
+                    return round(self.max, 3)
+                lower = max(self.bounds[index - 1] if index else 0, self.min)
+                upper = min(self.bounds[index], self.max)
+                return round(lower + (upper - lower) * (rank - seen) / count, 3)
+            seen += count
+        return round(self.max, 3)
+
+    def as_dict(self):
+        buckets = {f"le_{bound}": count for bound, count in zip(self.bounds, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.mean, 3) if self.count else None,
+            "max_ms": round(self.max, 3),
+            "last_ms": round(self.last, 3) if self.last is not None else None,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "buckets": buckets,
+        }
+
+
+class RecentLatencies:
+    """Durations of the last ``size`` requests.
+
+    Unlike the cumulative LatencyHistogram, its percentiles follow the
+    current state of the link, so a degrading Wi-Fi connection shows up
+    within minutes.
+    """
+
+    def __init__(self, size=RECENT_RTT_SAMPLES):
+        self.samples = deque(maxlen=size)
+
+    def record(self, seconds):
+        self.samples.append(seconds * 1000)
+
+    def percentile(self, point):
+        """Return the ``point`` percentile (ms, nearest rank) of the recent durations."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return round(ordered[max(0, -(-len(ordered) * point // 100) - 1)], 3)
+
+    def as_dict(self):
+        return {
+            "count": len(self.samples),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+        }
+
+
+class ClientStats:
+    """Counters and round-trip times of the requests of one client.
+
+    ``rtt`` only holds round trips answered on the first transmission, so
+    a reply to a retransmitted datagram never skews it (Karn's algorithm).
+    ``recent_rtt`` holds the same round trips, for the last requests only.
+    """
+
+    def __init__(self):
+        self.rtt = LatencyHistogram()
+        self.recent_rtt = RecentLatencies()
+        self.requests = 0
+        self.retransmissions = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.decode_failures = 0
+        self.rebinds = 0
+        self.commands = 0
+        self.command_retries = 0
+        self.command_timeouts = 0
+        self.command_failures = 0
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "retransmissions": self.retransmissions,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "decode_failures": self.decode_failures,
+            "rebinds": self.rebinds,
+            "commands": self.commands,
+            "command_retries": self.command_retries,
+            "command_timeouts": self.command_timeouts,
+            "command_failures": self.command_failures,
+            "rtt": self.rtt.as_dict(),
+            "recent_rtt": self.recent_rtt.as_dict(),
+        }
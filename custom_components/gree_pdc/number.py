@@ -1,28 +1,19 @@
 import logging
 from homeassistant.components.number import NumberEntity, NumberEntityDescription
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.const import EntityCategory
 
-from .const import DOMAIN, CONF_ID, CONF_NAME
+from .const import DOMAIN
+from .entity import GreePDCEntity
+from .registers import register_entities
 
 _LOGGER = logging.getLogger(__name__)
 
-class GreePDCNumber(CoordinatorEntity, NumberEntity):
-    _attr_has_entity_name = True
+class GreePDCNumber(GreePDCEntity, NumberEntity):
 
     def __init__(self, coordinator, client, entry, description: NumberEntityDescription):
-        super().__init__(coordinator)
+        super().__init__(coordinator, entry, description.key, frozenset((description.key,)))
         self.entity_description = description
         self._client = client
-        self._entry_id = entry.entry_id
-        device_name = entry.data.get(CONF_NAME, "Gree PDC")
-        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name=device_name,
-            manufacturer="Gree",
-            model="Versati",
-        )
 
     @property
     def native_value(self):
@@ -33,16 +24,11 @@ class GreePDCNumber(CoordinatorEntity, NumberEntity):
 
     async def async_set_native_value(self, value):
         _LOGGER.debug("Setting %s to %s", self.entity_description.key, value)
-        success = await self.hass.async_add_executor_job(
-            self._client.set_values, {self.entity_description.key: int(value)}
-        )
-        if success:
+        result = await self._client.async_queue_values({self.entity_description.key: int(value)})
+        if result:
             _LOGGER.debug("Successfully set %s to %s", self.entity_description.key, value)
-            if self.coordinator.data is not None:
-                self.coordinator.data[self.entity_description.key] = int(value)
-            self.async_write_ha_state()
         else:
-            _LOGGER.error("Failed to set %s to %s", self.entity_description.key, value)
+            _LOGGER.error("Failed to set %s to %s: %s", self.entity_description.key, value, result.status.value)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
@@ -50,35 +36,15 @@ async def async_setup_entry(hass, entry, async_add_entities):
     
     descriptions = [
         NumberEntityDescription(
-            key="WatBoxTemSet",
-            translation_key="setpoint_dhw",
-            native_min_value=30,
-            native_max_value=60,
-        ),
-        NumberEntityDescription(
-            key="HeWatOutTemSet",
-            translation_key="setpoint_heating_out_temp",
-            native_min_value=20,
-            native_max_value=50,
-        ),
-        NumberEntityDescription(
-            key="CoWatOutTemSet",
-            translation_key="setpoint_cooling_out_temp",
-            native_min_value=7,
-            native_max_value=25,
-        ),
-        NumberEntityDescription(
-            key="HeHomTemSet",
-            translation_key="setpoint_heating_room_temp",
-            native_min_value=16,
-            native_max_value=30,
-        ),
-        NumberEntityDescription(
-            key="CoHomTemSet",
-            translation_key="setpoint_cooling_room_temp",
-            native_min_value=16,
-            native_max_value=30,
-        ),
+            key=register.name,
+            translation_key=entity.translation_key,
+            icon=entity.icon,
+            entity_category=EntityCategory.CONFIG if entity.diagnostic else None,
+            entity_registry_enabled_default=entity.enabled_default,
+            native_min_value=register.min_value,
+            native_max_value=register.max_value,
+        )
+        for register, entity in register_entities(coordinator.columns, "number")
     ]
     
     _LOGGER.debug("Adding %d number entities", len(descriptions))
@@ -0,0 +1,113 @@
+"""Opt-in profiling of the Gree PDC poll and command pipeline."""
+import asyncio
+import cProfile
+import io
+import json
+import logging
+import pstats
+import time
+
+from .metrics import LatencyHistogram
+
+_LOGGER = logging.getLogger(__name__)
+
+# Rows of the cProfile report written by the profile service
+PROFILE_REPORT_ROWS = 60
+
+# Span histogram bounds (ms): stages like decryption take microseconds
+SPAN_BUCKETS = (0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+
+
+class _Span:
+    __slots__ = ("_spans", "_name", "_start")
+
+    def __init__(self, spans, name):
+        self._spans = spans
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._spans.record(self._name, time.perf_counter() - self._start)
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Spans:
+    """Timing spans of the stages of one device's pipeline.
+
+    Disabled by default: span() then returns a shared no-op context manager,
+    so the instrumented code only pays for one attribute check.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.histograms = {}
+
+    def span(self, name):
+        """Return a context manager timing the stage ``name`` while enabled."""
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name)
+
+    def record(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram(SPAN_BUCKETS)
+        histogram.record(seconds)
+
+    def reset(self):
+        self.histograms = {}
+
+    def as_dict(self):
+        return {name: histogram.as_dict() for name, histogram in self.histograms.items()}
+
+
+async def async_profile(hass, spans, duration, path):
+    """Profile the event loop for ``duration`` seconds and write a report to ``path``.
+
+    The spans of the device are enabled for the window and written along
+    with the cProfile statistics, sorted by cumulative time. The raw
+    statistics are saved next to the report with a ``.prof`` suffix.
+    """
+    profiler = cProfile.Profile()
+    was_enabled = spans.enabled
+    spans.reset()
+    spans.enabled = True
+    try:
+        # Raises ValueError when another profiler is already running
+        profiler.enable()
+        await asyncio.sleep(duration)
+    finally:
+        profiler.disable()
+        spans.enabled = was_enabled
+
+    span_stats = spans.as_dict()
+
+    def write_report():
+        report = io.StringIO()
+        stats = pstats.Stats(profiler, stream=report)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_REPORT_ROWS)
+        stats.dump_stats(f"{path}.prof")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(f"Gree PDC profile, {duration}s window\n\n")
+            file.write("Spans (ms):\n")
+            file.write(json.dumps(span_stats, indent=2))
+            file.write("\n\ncProfile:\n")
+            file.write(report.getvalue())
+
+    await hass.async_add_executor_job(write_report)
+    _LOGGER.info("Wrote Gree PDC profile to %s", path)
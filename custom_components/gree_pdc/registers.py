@@ -0,0 +1,147 @@
+"""Catalog of the Gree PDC status registers (columns).
+
+Every register the integration knows is declared here once: its value
+type, how often it is polled, whether it can be written and its range,
+the decimals register of a split temperature, and the entities generated
+for it. The registers a unit actually supports are probed once at setup
+and only those are polled and turned into entities.
+"""
+from dataclasses import dataclass
+from enum import Enum
+
+from .const import TIER_COLD, TIER_HOT, TIER_WARM
+
+
+class RegisterType(Enum):
+    """How the raw integer value of a register is interpreted."""
+
+    BOOL = "bool"
+    INT = "int"
+    ENUM = "enum"
+    # Integer part of a temperature, with a leading digit to drop; the
+    # decimals are in the ``low`` register
+    TEMP = "temp"
+    # Decimals of a TEMP register
+    TEMP_LOW = "temp_low"
+
+
+@dataclass(frozen=True)
+class RegisterEntity:
+    """An entity generated for a register."""
+
+    platform: str
+    key: str
+    translation_key: str
+    icon: str | None = None
+    device_class: str | None = None
+    diagnostic: bool = False
+    enabled_default: bool = True
+
+
+@dataclass(frozen=True)
+class Register:
+    """A status register of the unit."""
+
+    name: str
+    type: RegisterType
+    tier: int
+    writable: bool = False
+    min_value: int | None = None
+    max_value: int | None = None
+    low: str | None = None
+    entities: tuple[RegisterEntity, ...] = ()
+
+
+def _temperature(name, low, tier, key, diagnostic=False, enabled_default=True):
+    return (
+        Register(name, RegisterType.TEMP, tier, low=low, entities=(
+            RegisterEntity("sensor", key, key, diagnostic=diagnostic, enabled_default=enabled_default),
+        )),
+        Register(low, RegisterType.TEMP_LOW, tier),
+    )
+
+
+def _flag(name, tier, key, icon=None, device_class=None, diagnostic=False, enabled_default=True):
+    return Register(name, RegisterType.BOOL, tier, entities=(
+        RegisterEntity("binary_sensor", key, key, icon, device_class, diagnostic, enabled_default),
+    ))
+
+
+def _setpoint(name, key, min_value, max_value):
+    return Register(name, RegisterType.INT, TIER_WARM, writable=True,
+                    min_value=min_value, max_value=max_value, entities=(
+                        RegisterEntity("number", name, key),
+                    ))
+
+
+CATALOG = (
+    # Registers polled since the first release, in their original order
+    Register("Pow", RegisterType.BOOL, TIER_HOT, writable=True, min_value=0, max_value=1, entities=(
+        RegisterEntity("binary_sensor", "power", "power", device_class="power"),
+        RegisterEntity("switch", "Pow", "power_switch", icon="mdi:power"),
+    )),
+    # Operation mode: the select, sensor and state entities are built from it
+    # in their platforms
+    Register("Mod", RegisterType.ENUM, TIER_HOT, writable=True, min_value=1, max_value=5),
+    _setpoint("WatBoxTemSet", "setpoint_dhw", 30, 60),
+    _setpoint("HeWatOutTemSet", "setpoint_heating_out_temp", 20, 50),
+    _setpoint("CoWatOutTemSet", "setpoint_cooling_out_temp", 7, 25),
+    _setpoint("HeHomTemSet", "setpoint_heating_room_temp", 16, 30),
+    _setpoint("CoHomTemSet", "setpoint_cooling_room_temp", 16, 30),
+    Register("Quiet", RegisterType.BOOL, TIER_WARM, writable=True, min_value=0, max_value=1, entities=(
+        RegisterEntity("binary_sensor", "quiet_mode", "quiet_mode"),
+        RegisterEntity("switch", "Quiet", "quiet_mode_switch", icon="mdi:volume-mute"),
+    )),
+    *_temperature("AllInWatTemHi", "AllInWatTemLo", TIER_HOT, "in_water_temp"),
+    *_temperature("AllOutWatTemHi", "AllOutWatTemLo", TIER_HOT, "out_water_temp"),
+    *_temperature("WatBoxTemHi", "WatBoxTemLo", TIER_HOT, "temp_dhw"),
+    _flag("WatBoxElcHeRunSta", TIER_HOT, "boiler_heat_resistance"),
+    _flag("FastHtWter", TIER_HOT, "rapid_dhw"),
+    *_temperature("RmoHomTemHi", "RmoHomTemLo", TIER_HOT, "room_temp"),
+    _flag("WatBoxExt", TIER_COLD, "dhw_boiler_equipped"),
+    _flag("SyAnFroRunSta", TIER_HOT, "antifreeze_function"),
+    _flag("AnFrzzRunSta", TIER_HOT, "defrost_cycle"),
+    # Registers listed in parameters.txt, read-only until their writes are verified
+    _flag("RomHomTemExt", TIER_COLD, "room_temp_control", icon="mdi:home-thermometer", diagnostic=True),
+    _flag("HeHtWter", TIER_COLD, "heating_dhw_priority", diagnostic=True),
+    _flag("ColHtWter", TIER_COLD, "cooling_dhw_priority", diagnostic=True),
+    Register("TemUn", RegisterType.ENUM, TIER_COLD),
+    _flag("Emegcy", TIER_WARM, "emergency_mode", icon="mdi:alert", device_class="problem"),
+    _flag("LefHom", TIER_WARM, "away_mode", icon="mdi:home-export-outline"),
+    _flag("SwDisFct", TIER_WARM, "anti_legionella", icon="mdi:bacteria-outline"),
+    _flag("ElcHe1RunSta", TIER_HOT, "aux_heater_1", device_class="running", enabled_default=False),
+    _flag("ElcHe2RunSta", TIER_HOT, "aux_heater_2", device_class="running", enabled_default=False),
+    *_temperature("HepOutWatTemHi", "HepOutWatTemLo", TIER_COLD, "max_out_water_temp",
+                  diagnostic=True, enabled_default=False),
+)
+
+REGISTERS = {register.name: register for register in CATALOG}
+
+# Every known column, in catalog order
+STATUS_COLS = [register.name for register in CATALOG]
+
+# The columns polled since the first release, up to the catalog: entries
+# created before the registers were probed poll these until probed
+LEGACY_COLS = STATUS_COLS[:STATUS_COLS.index("AnFrzzRunSta") + 1]
+
+
+def supported_registers(columns):
+    """Return the catalog registers among ``columns``, in catalog order.
+
+    A split temperature is only supported when both its registers are.
+    """
+    columns = set(columns)
+    return [
+        register for register in CATALOG
+        if register.name in columns and (register.low is None or register.low in columns)
+    ]
+
+
+def register_entities(columns, platform):
+    """Return (register, entity) pairs of ``platform`` for the supported ``columns``."""
+    return [
+        (register, entity)
+        for register in supported_registers(columns)
+        for entity in register.entities
+        if entity.platform == platform
+    ]
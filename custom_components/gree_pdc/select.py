@@ -1,9 +1,8 @@
 import logging
 from homeassistant.components.select import SelectEntity
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.entity import DeviceInfo
 
-from .const import DOMAIN, CONF_ID, CONF_NAME
+from .const import DOMAIN
+from .entity import GreePDCEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -16,24 +15,13 @@ MODE_ID_TO_KEY = {
 }
 MODE_KEY_TO_ID = {v: k for k, v in MODE_ID_TO_KEY.items()}
 
-class GreePDCModeSelect(CoordinatorEntity, SelectEntity):
-    _attr_has_entity_name = True
+class GreePDCModeSelect(GreePDCEntity, SelectEntity):
     _attr_translation_key = "operation_mode"
     _attr_options = list(MODE_ID_TO_KEY.values())
 
     def __init__(self, coordinator, client, entry):
-        super().__init__(coordinator)
+        super().__init__(coordinator, entry, "operation_mode", frozenset(("Mod",)))
         self._client = client
-        self._entry_id = entry.entry_id
-        device_name = entry.data.get(CONF_NAME, "Gree PDC")
-        
-        self._attr_unique_id = f"{entry.entry_id}_operation_mode"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name=device_name,
-            manufacturer="Gree",
-            model="Versati",
-        )
 
     @property
     def current_option(self):
@@ -47,20 +35,18 @@ class GreePDCModeSelect(CoordinatorEntity, SelectEntity):
         _LOGGER.debug("Selecting mode %s", option)
         mod_val = MODE_KEY_TO_ID.get(option)
         if mod_val is not None:
-            success = await self.hass.async_add_executor_job(
-                self._client.set_values, {"Mod": mod_val}
-            )
-            if success:
+            result = await self._client.async_queue_values({"Mod": mod_val})
+            if result:
                 _LOGGER.debug("Successfully set mode to %s", option)
-                if self.coordinator.data is not None:
-                    self.coordinator.data["Mod"] = mod_val
-                self.async_write_ha_state()
             else:
-                _LOGGER.error("Failed to set mode to %s", option)
+                _LOGGER.error("Failed to set mode to %s: %s", option, result.status.value)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     client = hass.data[DOMAIN][entry.entry_id]["client"]
+    if "Mod" not in coordinator.columns:
+        _LOGGER.debug("Operation mode not supported, no select entity")
+        return
     
     _LOGGER.debug("Adding mode select entity")
     async_add_entities([GreePDCModeSelect(coordinator, client, entry)])
@@ -1,4 +1,5 @@
 import logging
+import time
 from dataclasses import dataclass
 from typing import Callable, Any
 
@@ -8,11 +9,18 @@ from homeassistant.components.sensor import (
     SensorStateClass,
     SensorEntityDescription,
 )
-from homeassistant.const import UnitOfTemperature
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.const import EntityCategory, UnitOfTemperature, UnitOfTime
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.significant_change import check_valid_float, either_one_none
 
-from .const import DOMAIN, CONF_ID, CONF_NAME
+from .const import (
+    DOMAIN,
+    TEMP_HEARTBEAT,
+)
+from .entity import GreePDCEntity
+from .filtering import exceeds_deadband, sensor_filter
+from .registers import RegisterType, register_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,6 +28,16 @@ _LOGGER = logging.getLogger(__name__)
 class GreePDCSensorEntityDescription(SensorEntityDescription):
     """Custom description for Gree PDC sensors."""
     transform: Callable[[dict], Any] | None = None
+    cols: tuple[str, ...] = ()
+    # Significant-change filtering, see GreePDCSensor
+    deadband: float | None = None
+    min_interval: float = 0
+    heartbeat: float | None = None
+
+@dataclass
+class GreePDCDiagnosticSensorEntityDescription(GreePDCSensorEntityDescription):
+    """Description of a sensor reporting transport statistics of the coordinator."""
+    value_fn: Callable[[Any], Any] | None = None
 
 def parse_temp(hi, lo):
     try:
@@ -32,24 +50,100 @@ def parse_temp(hi, lo):
     except (ValueError, TypeError, IndexError):
         return None
 
-class GreePDCSensor(CoordinatorEntity, SensorEntity):
-    _attr_has_entity_name = True
+class GreePDCSensor(GreePDCEntity, SensorEntity):
+    """Sensor computed from the polled columns.
+
+    When its description sets a ``deadband``, a new state is only written
+    for a move of at least ``deadband`` from the last written value.
+    Smaller changes are written once ``heartbeat`` seconds passed. With a
+    ``min_interval``, states are written at most that often. A held back
+    change is written by a timer, as no further update may come when the
+    columns stop changing. Availability changes and changes from or to
+    unknown are always written, and so is the confirmation of a restored
+    frame.
+    """
 
     def __init__(self, coordinator, entry, description: GreePDCSensorEntityDescription):
-        super().__init__(coordinator)
+        super().__init__(coordinator, entry, description.key, frozenset(description.cols) or None)
         self.entity_description = description
-        self._entry_id = entry.entry_id
-        device_name = entry.data.get(CONF_NAME, "Gree PDC")
-        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name=device_name,
-            manufacturer="Gree",
-            model="Versati",
-        )
+        self._filtered = description.deadband is not None or description.min_interval > 0
+        self._written_value = None
+        self._written_available = None
+        self._written_restored = None
+        self._written_at = None
+        self._cancel_write = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._remember_written()
+        self.async_on_remove(self._cancel_scheduled_write)
+
+    def _remember_written(self):
+        self._written_value = self._current_value()
+        self._written_available = self.available
+        self._written_restored = self.coordinator.restored
+        self._written_at = time.monotonic()
+
+    def _write_delay(self):
+        """Return in how many seconds the current value is to be written.
+
+        None when it is not to be written at all.
+        """
+        description = self.entity_description
+        value = self._current_value()
+        if (
+            self.available != self._written_available
+            or self.coordinator.restored != self._written_restored
+            or either_one_none(value, self._written_value)
+        ):
+            return 0
+        if value == self._written_value:
+            return None
+        if (
+            description.deadband is None
+            or not check_valid_float(value)
+            or exceeds_deadband(self._written_value, value, description.deadband)
+        ):
+            due = description.min_interval
+        elif description.heartbeat is not None:
+            due = max(description.heartbeat, description.min_interval)
+        else:
+            return None
+        return max(0, due - (time.monotonic() - self._written_at))
+
+    @callback
+    def _cancel_scheduled_write(self):
+        if self._cancel_write is not None:
+            self._cancel_write()
+            self._cancel_write = None
+
+    @callback
+    def _async_scheduled_write(self, _now):
+        self._cancel_write = None
+        if self._write_delay() is not None:
+            self._remember_written()
+            self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self._filtered:
+            self._cancel_scheduled_write()
+            delay = self._write_delay()
+            if delay is None:
+                return
+            if delay > 0:
+                self._cancel_write = async_call_later(self.hass, delay, self._async_scheduled_write)
+                return
+            self._remember_written()
+        super()._handle_coordinator_update()
 
     @property
     def native_value(self):
+        if self._filtered and self._written_at is not None:
+            return self._written_value
+        return self._current_value()
+
+    def _current_value(self):
         data = self.coordinator.data
         if data is None:
             return None
@@ -59,51 +153,139 @@ class GreePDCSensor(CoordinatorEntity, SensorEntity):
         
         return data.get(self.entity_description.key)
 
+class GreePDCDiagnosticSensor(GreePDCSensor):
+    """Transport statistics, kept available while the unit does not answer."""
+
+    @property
+    def available(self):
+        return True
+
+    @property
+    def extra_state_attributes(self):
+        return None
+
+    def _current_value(self):
+        return self.entity_description.value_fn(self.coordinator)
+
+def _whole_ms(value):
+    # Whole milliseconds: sub-millisecond noise would write a state every poll
+    return round(value) if value is not None else None
+
+DIAGNOSTIC_SENSORS = [
+    GreePDCDiagnosticSensorEntityDescription(
+        key="rtt_median",
+        translation_key="rtt_median",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda c: _whole_ms(c.client.stats.recent_rtt.percentile(50)),
+    ),
+    GreePDCDiagnosticSensorEntityDescription(
+        key="rtt_p95",
+        translation_key="rtt_p95",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        value_fn=lambda c: _whole_ms(c.client.stats.recent_rtt.percentile(95)),
+    ),
+    GreePDCDiagnosticSensorEntityDescription(
+        key="poll_duration",
+        translation_key="poll_duration",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        # Changes on every poll: one recorder row per poll when enabled
+        entity_registry_enabled_default=False,
+        value_fn=lambda c: c.poll_duration.last,
+    ),
+    GreePDCDiagnosticSensorEntityDescription(
+        key="request_timeouts",
+        translation_key="request_timeouts",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.client.stats.timeouts,
+    ),
+    GreePDCDiagnosticSensorEntityDescription(
+        key="retransmissions",
+        translation_key="retransmissions",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+        value_fn=lambda c: c.client.stats.retransmissions,
+    ),
+    GreePDCDiagnosticSensorEntityDescription(
+        key="command_retries",
+        translation_key="command_retries",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+        value_fn=lambda c: c.client.stats.command_retries,
+    ),
+    GreePDCDiagnosticSensorEntityDescription(
+        key="decode_failures",
+        translation_key="decode_failures",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+        value_fn=lambda c: c.client.stats.decode_failures,
+    ),
+    GreePDCDiagnosticSensorEntityDescription(
+        key="failed_polls",
+        translation_key="failed_polls",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.failed_polls,
+    ),
+    GreePDCDiagnosticSensorEntityDescription(
+        key="command_mismatches",
+        translation_key="command_mismatches",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.command_mismatches,
+    ),
+]
+
 async def async_setup_entry(hass, entry, async_add_entities):
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     from .select import MODE_ID_TO_KEY
     
-    descriptions = [
-        # Main Temperatures
-        GreePDCSensorEntityDescription(
-            key="in_water_temp",
-            translation_key="in_water_temp",
-            native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-            device_class=SensorDeviceClass.TEMPERATURE,
-            state_class=SensorStateClass.MEASUREMENT,
-            transform=lambda d: parse_temp(d.get("AllInWatTemHi"), d.get("AllInWatTemLo")),
-        ),
-        GreePDCSensorEntityDescription(
-            key="out_water_temp",
-            translation_key="out_water_temp",
+    columns = coordinator.columns
+    descriptions = []
+    for register, entity in register_entities(columns, "sensor"):
+        if register.type is not RegisterType.TEMP:
+            continue
+        deadband, min_interval = sensor_filter(entry.options, entity.key)
+        descriptions.append(GreePDCSensorEntityDescription(
+            key=entity.key,
+            translation_key=entity.translation_key,
+            icon=entity.icon,
+            entity_category=EntityCategory.DIAGNOSTIC if entity.diagnostic else None,
+            entity_registry_enabled_default=entity.enabled_default,
             native_unit_of_measurement=UnitOfTemperature.CELSIUS,
             device_class=SensorDeviceClass.TEMPERATURE,
             state_class=SensorStateClass.MEASUREMENT,
-            transform=lambda d: parse_temp(d.get("AllOutWatTemHi"), d.get("AllOutWatTemLo")),
-        ),
-        GreePDCSensorEntityDescription(
-            key="temp_dhw",
-            translation_key="temp_dhw",
-            native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-            device_class=SensorDeviceClass.TEMPERATURE,
-            state_class=SensorStateClass.MEASUREMENT,
-            transform=lambda d: parse_temp(d.get("WatBoxTemHi"), d.get("WatBoxTemLo")),
-        ),
-        GreePDCSensorEntityDescription(
-            key="room_temp",
-            translation_key="room_temp",
-            native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-            device_class=SensorDeviceClass.TEMPERATURE,
-            state_class=SensorStateClass.MEASUREMENT,
-            transform=lambda d: parse_temp(d.get("RmoHomTemHi"), d.get("RmoHomTemLo")),
-        ),
-        GreePDCSensorEntityDescription(
-            key="mode",
-            translation_key="operation_mode",
-            transform=lambda d: MODE_ID_TO_KEY.get(d.get("Mod")),
-        ),
-    ]
-    
+            transform=lambda d, hi=register.name, lo=register.low: parse_temp(d.get(hi), d.get(lo)),
+            cols=(register.name, register.low),
+            deadband=deadband or None,
+            min_interval=min_interval,
+            heartbeat=TEMP_HEARTBEAT,
+        ))
+    if "Mod" in columns:
+        descriptions.append(
+            GreePDCSensorEntityDescription(
+                key="mode",
+                translation_key="operation_mode",
+                transform=lambda d: MODE_ID_TO_KEY.get(d.get("Mod")),
+                cols=("Mod",),
+            )
+        )
+
     _LOGGER.debug("Adding %d sensors", len(descriptions))
     async_add_entities([GreePDCSensor(coordinator, entry, desc) for desc in descriptions])
+    async_add_entities([GreePDCDiagnosticSensor(coordinator, entry, desc) for desc in DIAGNOSTIC_SENSORS])
 
@@ -0,0 +1,116 @@
+"""Services of the Gree PDC integration."""
+import logging
+
+import voluptuous as vol
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .profiling import async_profile
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_SET_PROFILING = "set_profiling"
+SERVICE_PROFILE = "profile"
+SERVICE_EXPORT_HISTORY = "export_history"
+
+ATTR_ENABLED = "enabled"
+ATTR_DURATION = "duration"
+ATTR_FORMAT = "format"
+ATTR_START = "start"
+ATTR_END = "end"
+
+FORMAT_CSV = "csv"
+FORMAT_BINARY = "binary"
+
+DEFAULT_PROFILE_DURATION = 30
+MAX_PROFILE_DURATION = 600
+
+SET_PROFILING_SCHEMA = vol.Schema({
+    vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+    vol.Required(ATTR_ENABLED): cv.boolean,
+})
+
+PROFILE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+    vol.Optional(ATTR_DURATION, default=DEFAULT_PROFILE_DURATION): vol.All(
+        vol.Coerce(float), vol.Range(min=1, max=MAX_PROFILE_DURATION)
+    ),
+})
+
+EXPORT_HISTORY_SCHEMA = vol.Schema({
+    vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+    vol.Optional(ATTR_FORMAT, default=FORMAT_CSV): vol.In([FORMAT_CSV, FORMAT_BINARY]),
+    vol.Optional(ATTR_START): cv.datetime,
+    vol.Optional(ATTR_END): cv.datetime,
+})
+
+
+def _entry_data(hass: HomeAssistant, call: ServiceCall):
+    entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+    entry_data = hass.data.get(DOMAIN, {}).get(entry_id)
+    if not isinstance(entry_data, dict):
+        raise ServiceValidationError(f"Gree PDC entry {entry_id} is not loaded")
+    return entry_data
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the profiling and history services."""
+
+    async def set_profiling(call: ServiceCall) -> None:
+        """Turn the timing spans of one device on or off."""
+        spans = _entry_data(hass, call)["client"].spans
+        spans.enabled = call.data[ATTR_ENABLED]
+        if spans.enabled:
+            spans.reset()
+        _LOGGER.info(
+            "Profiling spans %s for %s",
+            "enabled" if spans.enabled else "disabled",
+            call.data[ATTR_CONFIG_ENTRY_ID],
+        )
+
+    async def profile(call: ServiceCall) -> None:
+        """Capture a cProfile window and the spans of one device to the config directory."""
+        entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+        spans = _entry_data(hass, call)["client"].spans
+        timestamp = dt_util.now().strftime("%Y%m%d-%H%M%S")
+        path = hass.config.path(f"{DOMAIN}_profile_{entry_id}_{timestamp}.txt")
+        try:
+            await async_profile(hass, spans, call.data[ATTR_DURATION], path)
+        except ValueError as err:
+            raise HomeAssistantError(f"Cannot start profiling: {err}") from err
+
+    async def export_history(call: ServiceCall) -> None:
+        """Write the recorded frames of one device in a time window to the config directory."""
+        entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+        # Copied on the event loop (a memory copy), encoded in the executor
+        history = _entry_data(hass, call)["coordinator"].history.copy()
+        start = call.data.get(ATTR_START)
+        end = call.data.get(ATTR_END)
+        # Naive times from the UI are in the zone configured in Home
+        # Assistant, not in the one of the OS
+        start = dt_util.as_local(start).timestamp() if start is not None else None
+        end = dt_util.as_local(end).timestamp() if end is not None else None
+
+        timestamp = dt_util.now().strftime("%Y%m%d-%H%M%S")
+        export_format = call.data[ATTR_FORMAT]
+        suffix = "csv" if export_format == FORMAT_CSV else "bin"
+        path = hass.config.path(f"{DOMAIN}_history_{entry_id}_{timestamp}.{suffix}")
+
+        def write():
+            if export_format == FORMAT_CSV:
+                content = history.to_csv(start, end).encode("utf-8")
+            else:
+                content = history.to_binary(start, end)
+            with open(path, "wb") as file:
+                file.write(content)
+
+        await hass.async_add_executor_job(write)
+        _LOGGER.info("Exported Gree PDC history of %s to %s", entry_id, path)
+
+    hass.services.async_register(DOMAIN, SERVICE_SET_PROFILING, set_profiling, schema=SET_PROFILING_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_PROFILE, profile, schema=PROFILE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_EXPORT_HISTORY, export_history, schema=EXPORT_HISTORY_SCHEMA)
@@ -1,28 +1,19 @@
 import logging
 from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.const import EntityCategory
 
-from .const import DOMAIN, CONF_ID, CONF_NAME
+from .const import DOMAIN
+from .entity import GreePDCEntity
+from .registers import register_entities
 
 _LOGGER = logging.getLogger(__name__)
 
-class GreePDCSwitch(CoordinatorEntity, SwitchEntity):
-    _attr_has_entity_name = True
+class GreePDCSwitch(GreePDCEntity, SwitchEntity):
 
     def __init__(self, coordinator, client, entry, description: SwitchEntityDescription):
-        super().__init__(coordinator)
+        super().__init__(coordinator, entry, description.key, frozenset((description.key,)))
         self.entity_description = description
         self._client = client
-        self._entry_id = entry.entry_id
-        device_name = entry.data.get(CONF_NAME, "Gree PDC")
-        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name=device_name,
-            manufacturer="Gree",
-            model="Versati",
-        )
 
     @property
     def is_on(self):
@@ -33,29 +24,19 @@ class GreePDCSwitch(CoordinatorEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs):
         _LOGGER.debug("Turning on %s", self.entity_description.key)
-        success = await self.hass.async_add_executor_job(
-            self._client.set_values, {self.entity_description.key: 1}
-        )
-        if success:
+        result = await self._client.async_queue_values({self.entity_description.key: 1})
+        if result:
             _LOGGER.debug("Successfully turned on %s", self.entity_description.key)
-            if self.coordinator.data is not None:
-                self.coordinator.data[self.entity_description.key] = 1
-            self.async_write_ha_state()
         else:
-            _LOGGER.error("Failed to turn on %s", self.entity_description.key)
+            _LOGGER.error("Failed to turn on %s: %s", self.entity_description.key, result.status.value)
 
     async def async_turn_off(self, **kwargs):
         _LOGGER.debug("Turning off %s", self.entity_description.key)
-        success = await self.hass.async_add_executor_job(
-            self._client.set_values, {self.entity_description.key: 0}
-        )
-        if success:
+        result = await self._client.async_queue_values({self.entity_description.key: 0})
+        if result:
             _LOGGER.debug("Successfully turned off %s", self.entity_description.key)
-            if self.coordinator.data is not None:
-                self.coordinator.data[self.entity_description.key] = 0
-            self.async_write_ha_state()
         else:
-            _LOGGER.error("Failed to turn off %s", self.entity_description.key)
+            _LOGGER.error("Failed to turn off %s: %s", self.entity_description.key, result.status.value)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
@@ -63,15 +44,13 @@ async def async_setup_entry(hass, entry, async_add_entities):
     
     descriptions = [
         SwitchEntityDescription(
-            key="Pow",
-            translation_key="power_switch",
-            icon="mdi:power",
-        ),
-        SwitchEntityDescription(
-            key="Quiet",
-            translation_key="quiet_mode_switch",
-            icon="mdi:volume-mute",
-        ),
+            key=register.name,
+            translation_key=entity.translation_key,
+            icon=entity.icon,
+            entity_category=EntityCategory.CONFIG if entity.diagnostic else None,
+            entity_registry_enabled_default=entity.enabled_default,
+        )
+        for register, entity in register_entities(coordinator.columns, "switch")
     ]
     
     _LOGGER.debug("Adding %d switches", len(descriptions))
@@ -0,0 +1,224 @@
+"""Shared UDP endpoint for Gree PDC devices."""
+import asyncio
+import json
+import logging
+import socket
+from collections import deque
+from contextlib import asynccontextmanager
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _GreePDCProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol handing every response to the shared endpoint."""
+
+    def __init__(self, endpoint):
+        self._endpoint = endpoint
+
+    def datagram_received(self, data, addr):
+        self._endpoint._datagram_received(data, addr)
+
+    def error_received(self, exc):
+        _LOGGER.debug("UDP endpoint error: %s", exc)
+
+    def connection_lost(self, exc):
+        self._endpoint._connection_lost(exc)
+
+
+class GreePDCEndpoint:
+    """One bound UDP socket multiplexing traffic for every device on a loop.
+
+    Clients register a handler for their (host, cid) pair; responses are
+    routed by source address and the ``cid`` of the envelope, falling back to
+    the source address alone for devices answering with an empty ``cid``.
+    """
+
+    _endpoints = {}
+
+    def __init__(self, loop):
+        self._loop = loop
+        self._transport = None
+        self._handlers = {}
+        self._refs = 0
+        self._open_lock = asyncio.Lock()
+
+    @classmethod
+    async def async_acquire(cls):
+        """Return the endpoint of the running loop, opening it on first use."""
+        loop = asyncio.get_running_loop()
+        endpoint = cls._endpoints.get(loop)
+        if endpoint is None:
+            endpoint = cls._endpoints[loop] = cls(loop)
+        endpoint._refs += 1
+        try:
+            await endpoint.async_open()
+        except Exception:
+            endpoint.release()
+            raise
+        return endpoint
+
+    def release(self):
+        """Drop one reference, closing the socket once nobody uses it."""
+        self._refs -= 1
+        if self._refs > 0:
+            return
+        if self._endpoints.get(self._loop) is self:
+            del self._endpoints[self._loop]
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    async def async_open(self):
+        """(Re)open the socket if it is not currently usable."""
+        if self._transport is not None and not self._transport.is_closing():
+            return
+        async with self._open_lock:
+            if self._transport is not None and not self._transport.is_closing():
+                return
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+                sock.setblocking(False)
+                sock.bind(("0.0.0.0", 0))
+            except OSError:
+                sock.close()
+                raise
+            self._transport, _ = await self._loop.create_datagram_endpoint(
+                lambda: _GreePDCProtocol(self), sock=sock
+            )
+            _LOGGER.debug("Opened shared Gree UDP endpoint on %s", sock.getsockname())
+
+    def register(self, host, device_id, handler):
+        """Route responses from ``host``/``device_id`` to ``handler``."""
+        self._handlers[(host, device_id)] = handler
+
+    def unregister(self, host, device_id, handler):
+        if self._handlers.get((host, device_id)) is handler:
+            del self._handlers[(host, device_id)]
+
+    def sendto(self, data, addr):
+        if self._transport is None or self._transport.is_closing():
+            raise ConnectionError("Gree UDP endpoint is closed")
+        self._transport.sendto(data, addr)
+
+    def _datagram_received(self, data, addr):
+        try:
+            response = json.loads(data)
+        except ValueError:
+            _LOGGER.debug("Discarding malformed datagram from %s", addr[0])
+            return
+        if not isinstance(response, dict):
+            return
+
+        handler = self._handlers.get((addr[0], response.get("cid")))
+        if handler is None:
+            handler = next(
+                (h for (host, _), h in self._handlers.items() if host == addr[0]),
+                None,
+            )
+        if handler is None:
+            _LOGGER.debug("Discarding unsolicited datagram from %s", addr[0])
+            return
+        handler(response)
+
+    def _connection_lost(self, exc):
+        self._transport = None
+        for handler in list(self._handlers.values()):
+            handler(exc or ConnectionError("Gree UDP endpoint closed"))
+
+
+class RequestGate:
+    """Bound the requests in flight to one device.
+
+    Every client owns a gate of ``limit`` slots. The last ``reserved`` slots
+    only go to commands, so a command never waits behind the chunks of a
+    status poll. Requests over the limit wait in FIFO order within their
+    kind. The gate keeps the queue depth and the time requests spent
+    waiting, so a slow or unreachable unit shows up as queueing on its own
+    gate instead of holding up the requests of other units.
+    """
+
+    def __init__(self, limit, reserved=0):
+        self.limit = max(1, limit)
+        self.reserved = min(reserved, self.limit - 1)
+        self.in_flight = 0
+        self._waiters = deque()
+        self.max_queue_depth = 0
+        self.waited = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def queue_depth(self):
+        return len(self._waiters)
+
+    def stats(self):
+        """Return the current load and the waiting statistics of the gate."""
+        return {
+            "limit": self.limit,
+            "reserved": self.reserved,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "waited": self.waited,
+            "avg_wait": self.wait_time / self.waited if self.waited else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+    def close(self):
+        """Fail every waiting request."""
+        while self._waiters:
+            waiter, _ = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(ConnectionError("Gree request gate closed"))
+
+    def _has_slot(self, command):
+        return self.in_flight < (self.limit if command else self.limit - self.reserved)
+
+    @asynccontextmanager
+    async def slot(self, command=False):
+        """Hold a slot for one request; ``command`` may take a reserved one."""
+        await self._acquire(command)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, command):
+        if self._has_slot(command) and not any(queued == command for _, queued in self._waiters):
+            self.in_flight += 1
+            return
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        entry = (waiter, command)
+        self._waiters.append(entry)
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        started = loop.time()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Cancelled right after being handed a slot: pass it on
+                self._release()
+            else:
+                self._waiters.remove(entry)
+            raise
+        waited = loop.time() - started
+        self.waited += 1
+        self.wait_time += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    def _release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        for entry in list(self._waiters):
+            waiter, command = entry
+            if waiter.done():
+                self._waiters.remove(entry)
+            elif self._has_slot(command):
+                self._waiters.remove(entry)
+                self.in_flight += 1
+                waiter.set_result(None)
@@ -0,0 +1,88 @@
+"""Benchmark the shared Gree UDP endpoint against emulated heat pumps.
+
+Runs 1, 10 and 50 emulated devices on loopback (in a child process) and
+polls all of them concurrently through GreePDCClient, reporting per-cycle
+latency and how many sockets/file descriptors the polling process holds.
+
+    python scripts/bench_endpoint.py [--cycles 50] [--devices 1 10 50]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+from benchlib import emulated_devices, load_component_module, make_clients
+
+
+def _open_sockets():
+    try:
+        fds = os.listdir("/proc/self/fd")
+    except FileNotFoundError:
+        return None, None
+    sockets = 0
+    for fd in fds:
+        try:
+            if os.readlink(f"/proc/self/fd/{fd}").startswith("socket:"):
+                sockets += 1
+        except OSError:
+            pass
+    return sockets, len(fds)
+
+
+async def _bench(gree_api, count, cycles, cols):
+    clients = make_clients(gree_api, count)
+
+    base_sockets, base_fds = _open_sockets()
+    latencies = []
+    peak_sockets = peak_fds = 0
+    for _ in range(cycles):
+        start = time.perf_counter()
+        await asyncio.gather(*(client.async_get_values(cols) for client in clients))
+        latencies.append((time.perf_counter() - start) * 1000)
+        sockets, fds = _open_sockets()
+        if sockets is not None:
+            peak_sockets = max(peak_sockets, sockets - base_sockets)
+            peak_fds = max(peak_fds, fds - base_fds)
+
+    for client in clients:
+        client.close()
+
+    latencies.sort()
+    return {
+        "devices": count,
+        "cycles": cycles,
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        "max_ms": round(latencies[-1], 2),
+        "sockets": peak_sockets if base_sockets is not None else None,
+        "fds": peak_fds if base_fds is not None else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=50)
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--json", action="store_true", help="emit JSON instead of a table")
+    args = parser.parse_args()
+
+    gree_api = load_component_module("gree_api")
+    cols = load_component_module("registers").STATUS_COLS
+    results = []
+    for count in args.devices:
+        with emulated_devices(count):
+            results.append(asyncio.run(_bench(gree_api, count, args.cycles, cols)))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'devices':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'sockets':>8} {'fds':>5}")
+    for row in results:
+        print(f"{row['devices']:>8} {row['p50_ms']:>8} {row['p95_ms']:>8} {row['max_ms']:>8} "
+              f"{row['sockets']!s:>8} {row['fds']!s:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Helpers shared by the benchmark scripts."""
+import asyncio
+import importlib
+import multiprocessing
+import sys
+import types
+from contextlib import contextmanager
+from pathlib import Path
+
+from gree_emulator import EmulatorConfig, start_emulator
+
+COMPONENT_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "gree_pdc"
+BASE_PORT = 17000
+DEVICE_KEY = "0123456789abcdef"
+
+
+def load_component_module(name):
+    """Import a module of the integration without running its Home Assistant setup."""
+    package = types.ModuleType("gree_pdc")
+    package.__path__ = [str(COMPONENT_DIR)]
+    sys.modules.setdefault("gree_pdc", package)
+    return importlib.import_module(f"gree_pdc.{name}")
+
+
+def device_id(index):
+    """Return the cid of the emulated device ``index``."""
+    return f"emu{index:08x}"
+
+
+def _run_devices(count, config, ready, stop):
+    async def main():
+        emulator = await start_emulator(count, config, base_port=BASE_PORT, key=DEVICE_KEY)
+        ready.set()
+        while not stop.is_set():
+            await asyncio.sleep(0.05)
+        emulator.close()
+
+    asyncio.run(main())
+
+
+@contextmanager
+def emulated_devices(count, config=None):
+    """Run ``count`` emulated devices in a child process for the duration of the block."""
+    ready, stop = multiprocessing.Event(), multiprocessing.Event()
+    process = multiprocessing.Process(
+        target=_run_devices, args=(count, config or EmulatorConfig(), ready, stop)
+    )
+    process.start()
+    try:
+        if not ready.wait(10):
+            raise RuntimeError("emulated devices did not start")
+        yield
+    finally:
+        stop.set()
+        process.join()
+
+
+def make_clients(gree_api, count):
+    """Return one GreePDCClient per emulated device."""
+    clients = []
+    for index in range(count):
+        client = gree_api.GreePDCClient("127.0.0.1", device_id(index), DEVICE_KEY)
+        client.port = BASE_PORT + index
+        clients.append(client)
+    return clients
+
+
+def percentiles(samples, points=(50, 90, 95, 99)):
+    """Return the given percentiles (nearest rank) and max of ``samples``, rounded."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    result = {
+        f"p{point}": round(ordered[max(0, -(-len(ordered) * point // 100) - 1)], 3)
+        for point in points
+    }
+    result["max"] = round(ordered[-1], 3)
+    return result
@@ -0,0 +1,170 @@
+"""Benchmark suite for the Gree PDC protocol codec and request round trips.
+
+Measures, against emulated devices on loopback:
+
+* codec: status requests encoded (from scratch and from the per-client
+  request cache) and responses decoded per second, for several column
+  counts;
+* poll: latency percentiles of async_get_values(STATUS_COLS), every column
+  of the register catalog, per request and per cycle over all devices;
+* command: latency percentiles of async_set_values until the ack.
+
+Results are written as JSON (stdout or --output) so runs can be compared.
+
+    python scripts/benchmark.py --devices 1 10 100 --output bench.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchlib import (
+    DEVICE_KEY,
+    emulated_devices,
+    load_component_module,
+    make_clients,
+    percentiles,
+)
+from gree_emulator import EmulatorConfig
+
+
+def _columns(status_cols, count):
+    cols = list(status_cols[:count])
+    cols.extend(f"Reg{index:03d}" for index in range(count - len(cols)))
+    return cols
+
+
+def _rate(func, duration):
+    """Return how many times per second ``func`` runs, over about ``duration`` seconds."""
+    calls = 0
+    start = time.perf_counter()
+    deadline = start + duration
+    while True:
+        for _ in range(100):
+            func()
+        calls += 100
+        now = time.perf_counter()
+        if now >= deadline:
+            return calls / (now - start)
+
+
+def bench_codec(gree_api, status_cols, column_counts, duration):
+    client = gree_api.GreePDCClient("127.0.0.1", "emu00000000", DEVICE_KEY)
+    results = []
+    for count in column_counts:
+        cols = _columns(status_cols, count)
+        response = json.loads(client._build_request(json.dumps({
+            "t": "dat", "mac": client.device_id, "r": 200, "cols": cols, "dat": [0] * count,
+        }), DEVICE_KEY))
+
+        def encode():
+            client._build_request(client._status_pack(cols), DEVICE_KEY)
+
+        def encode_cached():
+            client._status_request(cols)
+
+        def decode():
+            client._decode_pack(response["pack"], DEVICE_KEY)
+
+        results.append({
+            "columns": count,
+            "request_bytes": len(client._build_request(client._status_pack(cols), DEVICE_KEY)),
+            "response_bytes": len(json.dumps(response)),
+            "encode_per_s": round(_rate(encode, duration)),
+            "encode_cached_per_s": round(_rate(encode_cached, duration)),
+            "decode_per_s": round(_rate(decode, duration)),
+        })
+    return results
+
+
+async def _timed(coro):
+    start = time.perf_counter()
+    result = await coro
+    return (time.perf_counter() - start) * 1000, result
+
+
+async def _bench_round_trips(gree_api, cols, count, cycles):
+    clients = make_clients(gree_api, count)
+    requests, cycle_times, commands = [], [], []
+    failures = 0
+    try:
+        for _ in range(cycles):
+            start = time.perf_counter()
+            outcomes = await asyncio.gather(
+                *(_timed(client.async_get_values(cols)) for client in clients),
+                return_exceptions=True,
+            )
+            cycle_times.append((time.perf_counter() - start) * 1000)
+            for outcome in outcomes:
+                if isinstance(outcome, BaseException):
+                    failures += 1
+                else:
+                    requests.append(outcome[0])
+
+        for value in range(cycles):
+            outcomes = await asyncio.gather(
+                *(_timed(client.async_set_values({"Quiet": value % 2})) for client in clients)
+            )
+            commands.extend(elapsed for elapsed, result in outcomes if result)
+    finally:
+        for client in clients:
+            client.close()
+
+    return (
+        {"devices": count, "cycles": cycles, "failures": failures,
+         "request_ms": percentiles(requests), "cycle_ms": percentiles(cycle_times)},
+        {"devices": count, "commands": cycles * count, "acked": len(commands),
+         "ack_ms": percentiles(commands)},
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--cycles", type=int, default=50)
+    parser.add_argument("--columns", type=int, nargs="+", default=[5, 21, 60])
+    parser.add_argument("--codec-duration", type=float, default=1.0,
+                        help="seconds spent measuring each codec case")
+    parser.add_argument("--latency", type=float, default=0.0, help="emulated reply delay (s)")
+    parser.add_argument("--loss", type=float, default=0.0, help="emulated reply loss probability")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args()
+
+    gree_api = load_component_module("gree_api")
+    status_cols = load_component_module("registers").STATUS_COLS
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cycles": args.cycles,
+            "latency": args.latency,
+            "loss": args.loss,
+        },
+        "codec": bench_codec(gree_api, status_cols, args.columns, args.codec_duration),
+        "poll": [],
+        "command": [],
+    }
+    config = EmulatorConfig(latency=args.latency, loss=args.loss)
+    for count in args.devices:
+        with emulated_devices(count, config):
+            poll, command = asyncio.run(
+                _bench_round_trips(gree_api, status_cols, count, args.cycles)
+            )
+        results["poll"].append(poll)
+        results["command"].append(command)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""Local emulator of Gree PDC heat pumps speaking the UDP pack protocol.
+
+Every virtual device answers ``scan`` with a GENERIC_KEY encrypted pack,
+``bind`` with its device key, ``status`` for any column set and ``cmd``
+with ``r: 200``. Latency, packet loss, reordering and truncation are
+configurable, and any number of devices can run on loopback, either on
+consecutive ports of one address or on port 7000 of consecutive 127.0.0.x
+addresses (Linux routes the whole 127/8 block to loopback).
+
+    python scripts/gree_emulator.py --devices 10 --latency 0.02 --loss 0.05
+
+It can also be used from other scripts::
+
+    emulator = await start_emulator(10, EmulatorConfig(loss=0.1))
+    ...
+    emulator.close()
+"""
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import random
+from dataclasses import dataclass, field
+
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+_LOGGER = logging.getLogger("gree_emulator")
+
+GENERIC_KEY = "a3K8Bx%2r8Y7#xDh"
+DEVICE_PORT = 7000
+
+# Plausible register values; temperatures use the Hi/Lo encoding where the
+# first digit of Hi is dropped (135/4 -> 35.4 C)
+DEFAULT_STATE = {
+    "Pow": 1, "Mod": 4, "Quiet": 0,
+    "WatBoxTemSet": 48, "HeWatOutTemSet": 35, "CoWatOutTemSet": 18,
+    "HeHomTemSet": 21, "CoHomTemSet": 25,
+    "AllInWatTemHi": 131, "AllInWatTemLo": 2,
+    "AllOutWatTemHi": 135, "AllOutWatTemLo": 4,
+    "WatBoxTemHi": 146, "WatBoxTemLo": 7,
+    "RmoHomTemHi": 120, "RmoHomTemLo": 5,
+    "WatBoxElcHeRunSta": 0, "FastHtWter": 0, "WatBoxExt": 1,
+    "SyAnFroRunSta": 0, "AnFrzzRunSta": 0, "TemUn": 0,
+}
+
+
+@dataclass
+class EmulatorConfig:
+    """Network conditions applied to every reply of the emulated devices."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    loss: float = 0.0
+    reorder: float = 0.0
+    reorder_delay: float = 0.05
+    truncate: float = 0.0
+    seed: int | None = None
+    # Columns the devices do not know; status replies leave them out
+    unsupported: frozenset = field(default_factory=frozenset)
+
+
+def _encrypt(plain, key):
+    data = plain.encode("utf-8")
+    pad = 16 - len(data) % 16
+    encryptor = Cipher(algorithms.AES(key.encode("utf-8")), modes.ECB()).encryptor()
+    encrypted = encryptor.update(data + bytes([pad]) * pad) + encryptor.finalize()
+    return base64.b64encode(encrypted).decode("ascii")
+
+
+def _decrypt(encoded, key):
+    decryptor = Cipher(algorithms.AES(key.encode("utf-8")), modes.ECB()).decryptor()
+    data = decryptor.update(base64.b64decode(encoded)) + decryptor.finalize()
+    return json.loads(data[:-data[-1]])
+
+
+class EmulatedDevice(asyncio.DatagramProtocol):
+    """One virtual heat pump bound to its own UDP address."""
+
+    def __init__(self, mac, name, key, config, rng):
+        self.mac = mac
+        self.name = name
+        self.key = key
+        # Keys of earlier pairings, see pair()
+        self.previous_keys = []
+        self.config = config
+        self.state = dict(DEFAULT_STATE)
+        self.requests = 0
+        self.address = None
+        self._rng = rng
+        self._transport = None
+
+    def pair(self, key):
+        """Pair the device again with a new ``key``, as after a reset from the vendor app.
+
+        Requests encrypted with an earlier key are still understood, but
+        answered under the new key, so a client holding the old key gets
+        replies it cannot decrypt until it binds again.
+        """
+        self.previous_keys.append(self.key)
+        self.key = key
+
+    def connection_made(self, transport):
+        self._transport = transport
+        self.address = transport.get_extra_info("sockname")
+
+    def datagram_received(self, data, addr):
+        self.requests += 1
+        try:
+            reply = self.handle(json.loads(data))
+        except (ValueError, KeyError) as err:
+            _LOGGER.debug("%s: bad request from %s: %s", self.mac, addr, err)
+            return
+        if reply is not None:
+            self._send(json.dumps(reply).encode("utf-8"), addr)
+
+    def handle(self, request):
+        """Return the envelope replying to ``request``, or None."""
+        if request.get("t") == "scan":
+            pack = {"t": "dev", "cid": self.mac, "mac": self.mac, "name": self.name, "ver": "V1.0.0"}
+            return self._envelope(pack, GENERIC_KEY, i=1, tcid="")
+        if request.get("t") != "pack":
+            return None
+
+        if request.get("i") == 1:
+            pack = _decrypt(request["pack"], GENERIC_KEY)
+            if pack.get("t") != "bind":
+                return None
+            return self._envelope(
+                {"t": "bindok", "mac": self.mac, "key": self.key, "r": 200}, GENERIC_KEY, i=1
+            )
+
+        pack = self._decrypt_request(request["pack"])
+        if pack.get("t") == "status":
+            cols = [c for c in pack["cols"] if c not in self.config.unsupported]
+            reply = {"t": "dat", "mac": self.mac, "r": 200, "cols": cols,
+                     "dat": [self.state.get(c, 0) for c in cols]}
+        elif pack.get("t") == "cmd":
+            self.state.update(zip(pack["opt"], pack["p"]))
+            reply = {"t": "res", "mac": self.mac, "r": 200, "opt": pack["opt"],
+                     "p": pack["p"], "val": pack["p"]}
+        else:
+            return None
+        return self._envelope(reply, self.key)
+
+    def _decrypt_request(self, encoded):
+        for key in [self.key, *reversed(self.previous_keys)]:
+            try:
+                pack = _decrypt(encoded, key)
+            except ValueError:
+                continue
+            if isinstance(pack, dict):
+                return pack
+        raise ValueError("Pack is not encrypted with a key of the device")
+
+    def _envelope(self, pack, key, i=0, tcid="app"):
+        return {"t": "pack", "i": i, "uid": 0, "cid": self.mac, "tcid": tcid,
+                "pack": _encrypt(json.dumps(pack), key)}
+
+    def _send(self, payload, addr):
+        config, rng = self.config, self._rng
+        if rng.random() < config.loss:
+            return
+        if rng.random() < config.truncate:
+            payload = payload[:rng.randrange(1, len(payload))]
+        delay = config.latency + rng.uniform(0, config.jitter)
+        if rng.random() < config.reorder:
+            delay += config.reorder_delay
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self._sendto, payload, addr)
+        else:
+            self._sendto(payload, addr)
+
+    def _sendto(self, payload, addr):
+        if self._transport is not None and not self._transport.is_closing():
+            self._transport.sendto(payload, addr)
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+
+
+class Emulator:
+    """A set of running emulated devices."""
+
+    def __init__(self, devices):
+        self.devices = devices
+
+    def close(self):
+        for device in self.devices:
+            device.close()
+
+
+async def start_emulator(count, config=None, host="127.0.0.1", base_port=17000,
+                         spread_hosts=False, key="0123456789abcdef"):
+    """Start ``count`` devices on loopback and return the Emulator.
+
+    With ``spread_hosts`` device N listens on port 7000 of 127.0.0.(N+1),
+    otherwise on ``host`` at ``base_port + N``.
+    """
+    config = config or EmulatorConfig()
+    rng = random.Random(config.seed)
+    loop = asyncio.get_running_loop()
+    devices = []
+    try:
+        for index in range(count):
+            address = (f"127.0.0.{index + 1}", DEVICE_PORT) if spread_hosts else (host, base_port + index)
+            _, device = await loop.create_datagram_endpoint(
+                lambda index=index: EmulatedDevice(
+                    f"emu{index:08x}", f"Emulated PDC {index + 1}", key, config, rng
+                ),
+                local_addr=address,
+            )
+            devices.append(device)
+    except Exception:
+        Emulator(devices).close()
+        raise
+    return Emulator(devices)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=DEVICE_PORT)
+    parser.add_argument("--spread-hosts", action="store_true",
+                        help="one device per 127.0.0.x address on port 7000")
+    parser.add_argument("--key", default="0123456789abcdef", help="device key returned by bind")
+    parser.add_argument("--latency", type=float, default=0.0, help="reply delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay in seconds")
+    parser.add_argument("--loss", type=float, default=0.0, help="probability of dropping a reply")
+    parser.add_argument("--reorder", type=float, default=0.0,
+                        help="probability of delaying a reply past later ones")
+    parser.add_argument("--truncate", type=float, default=0.0,
+                        help="probability of cutting a reply short")
+    parser.add_argument("--unsupported", nargs="*", default=[], help="columns the devices do not know")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+
+    config = EmulatorConfig(
+        latency=args.latency, jitter=args.jitter, loss=args.loss, reorder=args.reorder,
+        truncate=args.truncate, seed=args.seed, unsupported=frozenset(args.unsupported),
+    )
+
+    async def run():
+        emulator = await start_emulator(
+            args.devices, config, host=args.host, base_port=args.base_port,
+            spread_hosts=args.spread_hosts, key=args.key,
+        )
+        for device in emulator.devices:
+            _LOGGER.info("%s (%s) listening on %s:%s", device.name, device.mac, *device.address)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            emulator.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
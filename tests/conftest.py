@@ -0,0 +1,69 @@
+"""Test helpers: the client modules of the integration and the emulator.
+
+The client, codec and transport do not depend on Home Assistant, so they
+are tested against emulated devices on loopback without it.
+"""
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from benchlib import DEVICE_KEY, device_id, load_component_module  # noqa: E402,F401
+from gree_emulator import EmulatorConfig, start_emulator  # noqa: E402,F401
+
+gree_api = load_component_module("gree_api")
+registers = load_component_module("registers")
+
+# Away from the ports used by the benchmark scripts
+BASE_PORT = 17200
+
+
+def make_client(index=0, **kwargs):
+    """Return a client for the emulated device ``index``."""
+    client = gree_api.GreePDCClient("127.0.0.1", device_id(index), DEVICE_KEY, **kwargs)
+    client.port = BASE_PORT + index
+    return client
+
+
+@asynccontextmanager
+async def emulated(count=1, config=None):
+    """Run ``count`` emulated devices for the duration of the block."""
+    emulator = await start_emulator(count, config or EmulatorConfig(), base_port=BASE_PORT, key=DEVICE_KEY)
+    try:
+        yield emulator
+    finally:
+        emulator.close()
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def delay_replies(device, delay, min_size=0):
+    """Hold back the replies of ``device`` of at least ``min_size`` bytes by ``delay`` seconds."""
+    send = device._send
+
+    def delayed_send(payload, addr):
+        if len(payload) >= min_size:
+            asyncio.get_running_loop().call_later(delay, device._sendto, payload, addr)
+        else:
+            send(payload, addr)
+
+    device._send = delayed_send
+
+
+def drop_replies(device, count):
+    """Drop the next ``count`` replies of ``device``."""
+    send = device._send
+    dropped = 0
+
+    def lossy_send(payload, addr):
+        nonlocal dropped
+        if dropped < count:
+            dropped += 1
+            return
+        send(payload, addr)
+
+    device._send = lossy_send
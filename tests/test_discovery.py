@@ -0,0 +1,54 @@
+"""Parsing of the discovery targets."""
+import pytest
+
+from conftest import DEVICE_KEY, device_id, load_component_module, run, start_emulator
+
+discovery = load_component_module("discovery")
+
+
+@pytest.mark.parametrize("target", ["192.168.1.20", " 192.168.1.0/24 ", "10.0.0.0/22", "10.0.0.7/22"])
+def test_accepts_ipv4_addresses_and_networks_up_to_a_22(target):
+    assert discovery.parse_target(target).version == 4
+
+
+@pytest.mark.parametrize("target", ["fe80::1", "2001:db8::/120", "10.0.0.0/21", "10.0.0.0/8", "gree.local", ""])
+def test_rejects_ipv6_oversized_networks_and_names(target):
+    with pytest.raises(ValueError):
+        discovery.parse_target(target)
+
+
+def test_targets_of_a_network():
+    hosts, count, broadcast = discovery._targets("192.168.1.0/30")
+    assert [str(host) for host in hosts] == ["192.168.1.1", "192.168.1.2"]
+    assert count == 2
+    assert broadcast == "192.168.1.3"
+
+
+def test_targets_of_a_single_address():
+    hosts, count, broadcast = discovery._targets("192.168.1.20")
+    assert ([str(host) for host in hosts], count, broadcast) == (["192.168.1.20"], 1, None)
+
+
+def test_broadcast_address_is_only_broadcast_to():
+    hosts, count, broadcast = discovery._targets("192.168.1.255")
+    assert (list(hosts), count, broadcast) == ([], 0, "192.168.1.255")
+
+
+def test_hosts_of_the_largest_network_are_generated_lazily():
+    hosts, count, _ = discovery._targets("10.0.0.0/22")
+    assert count == discovery.MAX_DISCOVERY_HOSTS - 2
+    assert not isinstance(hosts, (list, tuple))
+    assert str(next(hosts)) == "10.0.0.1"
+
+
+def test_discovers_the_devices_of_a_network():
+    async def scenario():
+        emulator = await start_emulator(3, spread_hosts=True, key=DEVICE_KEY)
+        try:
+            return [device async for device in discovery.async_discover("127.0.0.0/29", timeout=1)]
+        finally:
+            emulator.close()
+
+    devices = run(scenario())
+    assert sorted(device["host"] for device in devices) == ["127.0.0.1", "127.0.0.2", "127.0.0.3"]
+    assert sorted(device["id"] for device in devices) == [device_id(index) for index in range(3)]
@@ -0,0 +1,45 @@
+"""Significant-change filtering of the temperature sensors."""
+import pytest
+
+from conftest import load_component_module
+
+filtering = load_component_module("filtering")
+const = load_component_module("const")
+
+
+@pytest.mark.parametrize(
+    ("old", "new", "deadband", "expected"),
+    [
+        (20.1, 20.3, 0.2, True),
+        (20.3, 20.1, 0.2, True),
+        (20.0, 20.1, 0.2, False),
+        (20.0, 20.2, 0.2, True),
+        (19.9, 20.0, 0.1, True),
+        (20.0, 20.0, 0.1, False),
+        (45.7, 47.2, 1.5, True),
+        (45.7, 47.1, 1.5, False),
+    ],
+)
+def test_exceeds_deadband_compares_in_tenths(old, new, deadband, expected):
+    assert filtering.exceeds_deadband(old, new, deadband) is expected
+
+
+def test_sensor_filter_defaults():
+    assert filtering.sensor_filter({}, "room_temp") == (
+        const.DEFAULT_TEMP_DEADBAND,
+        const.DEFAULT_TEMP_MIN_INTERVAL,
+    )
+
+
+def test_sensor_filter_own_settings_override_the_common_ones():
+    options = {
+        const.CONF_TEMP_DEADBAND: 0.5,
+        const.CONF_TEMP_MIN_INTERVAL: 60,
+        const.CONF_SENSOR_FILTERS: {
+            "room_temp": {const.CONF_TEMP_MIN_INTERVAL: 300},
+            "temp_dhw": {const.CONF_TEMP_DEADBAND: 0},
+        },
+    }
+    assert filtering.sensor_filter(options, "room_temp") == (0.5, 300)
+    assert filtering.sensor_filter(options, "temp_dhw") == (0, 60)
+    assert filtering.sensor_filter(options, "in_water_temp") == (0.5, 60)
@@ -0,0 +1,240 @@
+"""GreePDCClient against emulated devices."""
+import asyncio
+
+import pytest
+
+from conftest import (
+    EmulatorConfig,
+    delay_replies,
+    drop_replies,
+    emulated,
+    gree_api,
+    make_client,
+    registers,
+    run,
+)
+
+NEW_KEY = "fedcba9876543210"
+
+
+def test_status_reply_goes_to_the_request_for_its_columns():
+    async def scenario():
+        async with emulated() as emulator:
+            # The reply to the full poll arrives after the one-column read
+            delay_replies(emulator.devices[0], 0.2, min_size=600)
+            client = make_client()
+            try:
+                poll = asyncio.create_task(client.async_get_values(registers.STATUS_COLS))
+                await asyncio.sleep(0.01)
+                single = await client.async_get_values(["WatBoxTemSet"])
+                full = await poll
+            finally:
+                client.close()
+        return single, full
+
+    single, full = run(scenario())
+    assert single["cols"] == ["WatBoxTemSet"]
+    assert full["cols"] == registers.STATUS_COLS
+
+
+def test_lost_reply_is_retransmitted_within_the_budget():
+    async def scenario():
+        async with emulated() as emulator:
+            drop_replies(emulator.devices[0], 1)
+            client = make_client()
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            try:
+                response = await client.async_get_values(["Pow"], timeout=2)
+            finally:
+                client.close()
+            return response, loop.time() - started, client.stats
+
+    response, elapsed, stats = run(scenario())
+    assert response["cols"] == ["Pow"]
+    assert stats.retransmissions == 1
+    assert stats.timeouts == 0
+    # One retransmission interval, not the whole budget
+    assert elapsed < gree_api.MAX_RTO + 0.5
+
+
+def test_breaker_opens_fails_fast_and_closes_on_probe():
+    async def scenario():
+        client = make_client()
+        try:
+            # Nothing listens yet: the device does not answer
+            for _ in range(gree_api.BREAKER_THRESHOLD):
+                with pytest.raises(asyncio.TimeoutError):
+                    await client.async_get_values(["Pow"], timeout=0.2)
+            assert client.breaker.is_open
+
+            requests = client.stats.requests
+            with pytest.raises(gree_api.DeviceOfflineError):
+                await client.async_get_values(["Pow"])
+            assert client.stats.requests == requests
+
+            async with emulated():
+                client.breaker.probe_interval = 0
+                response = await client.async_get_values(["Pow"])
+            assert not client.breaker.is_open
+            return response
+        finally:
+            client.close()
+
+    assert run(scenario())["cols"] == ["Pow"]
+
+
+def test_rebinds_a_device_paired_again():
+    async def scenario():
+        async with emulated() as emulator:
+            client = make_client()
+            keys = []
+            client.on_key_change = keys.append
+            try:
+                await client.async_get_values(["Pow"])
+                emulator.devices[0].pair(NEW_KEY)
+                response = await client.async_get_values(["Pow", "Mod"])
+                result = await client.async_set_values({"Quiet": 1})
+            finally:
+                client.close()
+            return client, keys, response, result, emulator.devices[0].state
+
+    client, keys, response, result, state = run(scenario())
+    assert response["cols"] == ["Pow", "Mod"]
+    assert keys == [NEW_KEY]
+    assert client.device_key == NEW_KEY
+    assert client.stats.rebinds == 1
+    assert result.status is gree_api.CommandStatus.ACKED
+    assert state["Quiet"] == 1
+
+
+def test_chunks_of_a_large_read_are_merged():
+    cols = registers.STATUS_COLS + [f"Extra{index:02d}" for index in range(60)]
+
+    async def scenario():
+        async with emulated() as emulator:
+            client = make_client()
+            try:
+                response = await client.async_get_values(cols)
+            finally:
+                client.close()
+            return client, response, emulator.devices[0].state
+
+    client, response, state = run(scenario())
+    assert len(client._request_plan(cols)) > 1
+    assert sorted(response["cols"]) == sorted(cols)
+    assert response["dat"] == [state.get(col, 0) for col in response["cols"]]
+
+
+def test_concurrent_writes_are_coalesced_into_one_command():
+    writes = [{"Pow": 0}, {"Quiet": 1}, {"WatBoxTemSet": 52}, {"Quiet": 0}]
+
+    async def scenario():
+        async with emulated() as emulator:
+            client = make_client()
+            acked = []
+            client.on_command_acked = acked.append
+            try:
+                results = await asyncio.gather(*(client.async_queue_values(values) for values in writes))
+            finally:
+                client.close()
+            return client, acked, results, emulator.devices[0]
+
+    client, acked, results, device = run(scenario())
+    assert all(results)
+    assert client.stats.commands == 1
+    assert acked == [{"Pow": 0, "Quiet": 0, "WatBoxTemSet": 52}]
+    assert device.state["Pow"] == 0
+    assert device.state["WatBoxTemSet"] == 52
+    assert device.requests == 1
+
+
+def test_emulated_devices_are_told_apart_by_cid():
+    async def scenario():
+        async with emulated(2):
+            first, second = make_client(0), make_client(1)
+            try:
+                return await asyncio.gather(
+                    first.async_set_values({"Pow": 0}), second.async_get_values(["Pow"])
+                )
+            finally:
+                first.close()
+                second.close()
+
+    command, status = run(scenario())
+    assert command
+    assert status["cols"] == ["Pow"]
+    assert status["dat"] == [1]
+
+
+def test_verify_reads_overlapping_polls_under_reorder_and_loss():
+    config = EmulatorConfig(latency=0.005, jitter=0.01, loss=0.1, reorder=0.3, reorder_delay=0.03, seed=7)
+
+    async def scenario():
+        reads = []
+
+        async def read(client, cols):
+            try:
+                reads.append((cols, await client.async_get_values(cols, timeout=3)))
+            except asyncio.TimeoutError:
+                pass
+
+        async with emulated(config=config):
+            client = make_client()
+            try:
+                for round_ in range(15):
+                    # What the coordinator does: a poll, a command and the
+                    # single-column read verifying it, all in flight at once
+                    await asyncio.gather(
+                        read(client, registers.STATUS_COLS),
+                        client.async_set_values({"WatBoxTemSet": 40 + round_}),
+                        read(client, ["WatBoxTemSet"]),
+                        read(client, ["Pow", "Mod"]),
+                    )
+            finally:
+                client.close()
+        return reads
+
+    reads = run(scenario())
+    assert len(reads) > 30
+    for cols, response in reads:
+        assert response["cols"] == cols
+        assert len(response["dat"]) == len(cols)
+
+
+def test_command_does_not_wait_behind_a_chunked_poll():
+    cols = registers.STATUS_COLS + [f"Extra{index:02d}" for index in range(150)]
+
+    async def scenario():
+        async with emulated() as emulator:
+            # Status replies are slow, command replies are not
+            delay_replies(emulator.devices[0], 0.5, min_size=600)
+            client = make_client()
+            loop = asyncio.get_running_loop()
+            try:
+                poll = asyncio.create_task(client.async_get_values(cols))
+                await asyncio.sleep(0.01)
+                started = loop.time()
+                result = await client.async_set_values({"Pow": 0})
+                elapsed = loop.time() - started
+                await poll
+            finally:
+                client.close()
+            return client, result, elapsed
+
+    client, result, elapsed = run(scenario())
+    assert len(client._request_plan(cols)) > gree_api.REQUESTS_PER_DEVICE
+    assert result.status is gree_api.CommandStatus.ACKED
+    assert elapsed < 0.25
+    assert client.gate.stats()["waited"] > 0
+
+
+def test_breaker_probes_on_polls_firing_a_little_early():
+    breaker = gree_api.CircuitBreaker("127.0.0.1", threshold=1, probe_interval=30)
+    breaker.record_failure(100.0)
+    assert breaker.is_open
+    assert not breaker.probe_due(110.0)
+    # The coordinator's poll at the probe interval, scheduled 0.6 s early
+    assert breaker.probe_due(129.4)
+    assert not breaker.probe_due(140.0)
+    assert breaker.probe_due(159.0)
@@ -0,0 +1,79 @@
+"""FrameHistory: the ring buffer of raw frames and its exports."""
+import struct
+
+from conftest import load_component_module
+
+history = load_component_module("history")
+
+COLUMNS = ("Pow", "Mod", "WatBoxTemHi")
+
+
+def filled(count, capacity=4):
+    frames = history.FrameHistory(COLUMNS, capacity)
+    for index in range(count):
+        frames.append(1000.0 + index, {"Pow": 1, "Mod": index, "WatBoxTemHi": 150 + index})
+    return frames
+
+
+def test_ring_keeps_the_latest_frames_oldest_first():
+    frames = filled(6)
+    assert len(frames) == 4
+    assert [timestamp for timestamp, _ in frames.frames()] == [1002.0, 1003.0, 1004.0, 1005.0]
+    assert [row[1] for _, row in frames.frames()] == [2, 3, 4, 5]
+
+
+def test_partial_ring():
+    frames = filled(2)
+    assert len(frames) == 2
+    assert list(frames.frames()) == [(1000.0, [1, 0, 150]), (1001.0, [1, 1, 151])]
+
+
+def test_window_bounds_are_inclusive():
+    frames = filled(6)
+    assert [timestamp for timestamp, _ in frames.frames(start=1003.0, end=1004.0)] == [1003.0, 1004.0]
+    assert [timestamp for timestamp, _ in frames.frames(start=1004.5)] == [1005.0]
+    assert list(frames.frames(end=999.0)) == []
+
+
+def test_missing_and_non_integer_values():
+    frames = history.FrameHistory(COLUMNS, 2)
+    frames.append(1.0, {"Pow": 1, "Mod": "x", "WatBoxTemHi": 2 ** 31})
+    assert list(frames.frames()) == [(1.0, [1, None, None])]
+
+
+def test_copy_is_independent():
+    frames = filled(3)
+    copy = frames.copy()
+    frames.append(2000.0, {"Pow": 0})
+    assert len(copy) == 3
+    assert [timestamp for timestamp, _ in copy.frames()] == [1000.0, 1001.0, 1002.0]
+
+
+def test_csv_export():
+    frames = history.FrameHistory(COLUMNS, 4)
+    frames.append(1.5, {"Pow": 1, "Mod": 2})
+    assert frames.to_csv() == "timestamp,Pow,Mod,WatBoxTemHi\n1.500,1,2,\n"
+
+
+def test_binary_export_of_a_window():
+    frames = filled(6)
+    data = frames.to_binary(start=1004.0)
+
+    assert data[:8] == history.BINARY_MAGIC
+    version, width, count, names_length = struct.unpack_from("<HHII", data, 8)
+    assert (version, width, count) == (history.BINARY_VERSION, 3, 2)
+    offset = 8 + struct.calcsize("<HHII")
+    assert data[offset:offset + names_length].decode() == ",".join(COLUMNS)
+    offset += names_length
+
+    record = struct.Struct("<d3i")
+    assert len(data) - offset == 2 * record.size
+    assert record.unpack_from(data, offset) == (1004.0, 1, 4, 154)
+    assert record.unpack_from(data, offset + record.size) == (1005.0, 1, 5, 155)
+
+
+def test_binary_export_marks_missing_values():
+    frames = history.FrameHistory(COLUMNS, 1)
+    frames.append(7.0, {"Pow": 0})
+    data = frames.to_binary()
+    assert struct.unpack_from("<d3i", data, len(data) - 20) == (7.0, 0, history.MISSING, history.MISSING)
@@ -0,0 +1,49 @@
+"""Latency statistics of the client."""
+import pytest
+
+from conftest import load_component_module
+
+metrics = load_component_module("metrics")
+
+
+def test_histogram_percentiles_interpolate_inside_buckets():
+    histogram = metrics.LatencyHistogram(bounds=(10, 20, 50))
+    for ms in (2, 4, 6, 8, 12, 14, 16, 18, 30, 40):
+        histogram.record(ms / 1000)
+    assert histogram.count == 10
+    assert histogram.mean == pytest.approx(15)
+    assert histogram.counts == [4, 4, 2, 0]
+    # Rank 5 is the first of the 4 samples of the 10-20 ms bucket
+    assert histogram.percentile(50) == pytest.approx(12.5)
+    # Rank 10 is the last of the 20-50 ms bucket, capped at the maximum
+    assert histogram.percentile(95) == pytest.approx(40)
+
+
+def test_histogram_overflow_bucket_reports_the_maximum():
+    histogram = metrics.LatencyHistogram(bounds=(10,))
+    histogram.record(0.005)
+    histogram.record(0.250)
+    assert histogram.percentile(95) == pytest.approx(250)
+    assert histogram.as_dict()["buckets"] == {"le_10": 1, "le_inf": 1}
+
+
+def test_empty_statistics():
+    assert metrics.LatencyHistogram().percentile(50) is None
+    assert metrics.RecentLatencies().percentile(50) is None
+    assert metrics.LatencyHistogram().as_dict()["mean_ms"] is None
+
+
+def test_recent_latencies_use_the_nearest_rank():
+    recent = metrics.RecentLatencies(size=100)
+    for ms in range(1, 101):
+        recent.record(ms / 1000)
+    assert recent.percentile(50) == pytest.approx(50)
+    assert recent.percentile(95) == pytest.approx(95)
+    assert recent.percentile(100) == pytest.approx(100)
+
+
+def test_recent_latencies_forget_old_samples():
+    recent = metrics.RecentLatencies(size=4)
+    for ms in (900, 900, 900, 900, 10, 20, 30, 40):
+        recent.record(ms / 1000)
+    assert recent.as_dict() == {"count": 4, "p50_ms": 20, "p95_ms": 40}
@@ -0,0 +1,25 @@
+"""The register catalog."""
+from conftest import registers
+
+
+def test_legacy_columns_are_the_ones_polled_before_the_catalog():
+    assert len(registers.LEGACY_COLS) == 21
+    assert registers.LEGACY_COLS == registers.STATUS_COLS[:21]
+    assert "RomHomTemExt" not in registers.LEGACY_COLS
+
+
+def test_split_temperature_needs_both_registers():
+    supported = [register.name for register in registers.supported_registers(["Pow", "AllInWatTemHi"])]
+    assert supported == ["Pow"]
+    supported = [
+        register.name
+        for register in registers.supported_registers(["AllInWatTemLo", "AllInWatTemHi", "Pow"])
+    ]
+    assert supported == ["Pow", "AllInWatTemHi", "AllInWatTemLo"]
+
+
+def test_entities_only_for_supported_registers():
+    entities = registers.register_entities(registers.LEGACY_COLS, "binary_sensor")
+    keys = [entity.key for _, entity in entities]
+    assert "power" in keys
+    assert "emergency_mode" not in keys
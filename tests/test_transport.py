@@ -0,0 +1,100 @@
+"""RequestGate: the per-device bound on requests in flight."""
+import asyncio
+
+import pytest
+
+from conftest import load_component_module, run
+
+transport = load_component_module("transport")
+
+
+async def hold(gate, command, release, started):
+    async with gate.slot(command):
+        started.append(command)
+        await release.wait()
+
+
+def test_reads_queue_while_commands_take_the_reserved_slot():
+    async def scenario():
+        gate = transport.RequestGate(3, reserved=1)
+        release = asyncio.Event()
+        started = []
+        reads = [asyncio.create_task(hold(gate, False, release, started)) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert started == [False, False]
+        assert gate.queue_depth == 1
+
+        command = asyncio.create_task(hold(gate, True, release, started))
+        await asyncio.sleep(0)
+        assert started == [False, False, True]
+        assert gate.in_flight == 3
+
+        release.set()
+        await asyncio.gather(*reads, command)
+        return gate.stats()
+
+    stats = run(scenario())
+    assert stats["in_flight"] == 0
+    assert stats["queue_depth"] == 0
+    assert stats["max_queue_depth"] == 1
+    assert stats["waited"] == 1
+    assert stats["max_wait"] >= 0
+
+
+def test_requests_wait_in_fifo_order():
+    async def scenario():
+        gate = transport.RequestGate(1)
+        order = []
+
+        async def request(index):
+            async with gate.slot():
+                order.append(index)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(request(index) for index in range(4)))
+        return order, gate.stats()
+
+    order, stats = run(scenario())
+    assert order == [0, 1, 2, 3]
+    assert stats["waited"] == 3
+    assert stats["max_queue_depth"] == 3
+    assert stats["avg_wait"] > 0
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    async def scenario():
+        gate = transport.RequestGate(1)
+        release = asyncio.Event()
+        started = []
+        first = asyncio.create_task(hold(gate, False, release, started))
+        second = asyncio.create_task(hold(gate, False, release, started))
+        third = asyncio.create_task(hold(gate, False, release, started))
+        await asyncio.sleep(0)
+        second.cancel()
+        release.set()
+        await asyncio.gather(first, third)
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        return started, gate
+
+    started, gate = run(scenario())
+    assert started == [False, False]
+    assert gate.in_flight == 0
+    assert gate.queue_depth == 0
+
+
+def test_close_fails_the_waiting_requests():
+    async def scenario():
+        gate = transport.RequestGate(1)
+        release = asyncio.Event()
+        started = []
+        first = asyncio.create_task(hold(gate, False, release, started))
+        second = asyncio.create_task(hold(gate, False, release, started))
+        await asyncio.sleep(0)
+        gate.close()
+        with pytest.raises(ConnectionError):
+            await second
+        release.set()
+        await first
+
+    run(scenario())